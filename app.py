@@ -1,12 +1,27 @@
 import os
 import json
+import math
 import time
 import random
+import hashlib
+import functools
 import urllib.parse
-import requests
+from concurrent.futures import ThreadPoolExecutor, wait
 import streamlit as st
-from openai import OpenAI
-from openai import APIConnectionError, RateLimitError, APITimeoutError, APIError
+
+from tourapi import fetch_areas_concurrently, local_index_available, STREAM_PAGE_SIZE, STREAM_MAX_ROWS
+from spot_index import get_spot_index
+from ranking import rank_pool, early_stop_rule, enrichment_shortlist, spot_travel_hours, RANK_ENGINES, RANK_SCORERS
+from enrich import ENRICH_PER_AREA, enrich_spots
+from geo import TravelModel
+from spots import Spot
+from thumbs import card_image, prefetch_thumbnails, wait_for as wait_for_thumbnails
+from memory import ConversationMemory
+from plans import plan_cache, plan_fingerprint, validate_plan
+from llm import Deadline, openai_healthy, safe_openai_chat_create, stream_openai_chat
+from telemetry import bind, count, recent_traces, span, stage_percentiles, trace
+
+PAGE_STARTED = time.perf_counter()
 
 # =========================================================
 # Page
@@ -28,11 +43,9 @@ st.sidebar.caption("OpenAI 키 + 한국관광공사 TourAPI 키를 입력해야
 OPENAI_API_KEY = openai_key_input or os.getenv("OPENAI_API_KEY", "")
 TOUR_API_KEY = tour_key_input or os.getenv("TOUR_API_KEY", "")
 
-# =========================================================
-# TourAPI Constants
-# =========================================================
-TOUR_BASE = "https://apis.data.go.kr/B551011/KorService2"
-CONTENT_TYPE_TOUR = 12  # 관광지
+spot_index = get_spot_index() if local_index_available() else None
+if spot_index is not None:
+    st.sidebar.caption(f"📦 로컬 관광지 인덱스 사용 중 ({len(spot_index)}곳, {spot_index.meta.get('created_at', '')[:10]} 기준) — TourAPI 키 없이도 추천돼요.")
 
 # =========================================================
 # CSS
@@ -70,6 +83,46 @@ if "reasons" not in st.session_state:
     st.session_state.reasons = {}
 if "rerun_seed" not in st.session_state:
     st.session_state.rerun_seed = 0
+if "memory" not in st.session_state:
+    st.session_state.memory = ConversationMemory()  # 토큰 예산 + 누적 요약
+if "pool" not in st.session_state:
+    st.session_state.pool = None  # {"fingerprint": str, "spots": list} — 다시 뽑기용 랭킹 후보
+if "rerun_times" not in st.session_state:
+    st.session_state.rerun_times = []  # [(구역, ms), ...] 최근 rerun 소요 시간
+if "traces" not in st.session_state:
+    st.session_state.traces = []  # 최근 클릭(결과 보기/다시 뽑기)의 단계별 시간 + 카운터
+if "reason_deadline" not in st.session_state:
+    st.session_state.reason_deadline = None  # 이번 클릭의 LLM Deadline — 카드를 그린 뒤 이유 스트리밍이 이어서 씀
+
+# =========================================================
+# Rerun timing (전체 페이지 / fragment별)
+# =========================================================
+RERUN_TIMES_MAX = 20
+SESSION_TRACES_MAX = 10
+DEBUG_PANEL = os.getenv("DEBUG_PANEL", "0") == "1"  # 사이드바 디버그 패널 기본값
+
+def record_rerun_time(name: str, started: float) -> None:
+    times = st.session_state.rerun_times
+    times.append((name, round((time.perf_counter() - started) * 1000, 1)))
+    del times[:-RERUN_TIMES_MAX]
+
+def remember_trace(tr) -> None:
+    traces = st.session_state.traces
+    traces.append(tr.to_dict())
+    del traces[:-SESSION_TRACES_MAX]
+
+def timed(name: str):
+    # fragment 함수에 붙여서 fragment 단독 rerun 시간도 기록
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record_rerun_time(name, started)
+        return wrapper
+    return decorator
 
 # =========================================================
 # UI Header
@@ -83,14 +136,28 @@ st.caption("선호도 조사(복수 선택) + 추가 입력을 기반으로, 당
 st.subheader("📝 선호도 조사 (복수 선택 가능)")
 st.caption("정확한 추천을 위해 최소 '선호 풍경/이동수단/여행기간'은 1개 이상 선택해주세요.")
 
-purpose = st.multiselect("질문 1: 여행 목적은 무엇인가요?", ["힐링", "휴양", "액티비티", "관광"], default=[], key="purpose")
-companion = st.multiselect("질문 2: 여행의 동반자는 누구인가요?", ["혼자", "연인", "가족", "친구"], default=[], key="companion")
-transport = st.multiselect("질문 3: 이동수단은 어떻게 되나요?", ["고속버스", "기차", "자동차", "비행기"], default=[], key="transport")
-trip_days = st.multiselect("질문 4: 여행 기간은 어떻게 되나요?", ["당일여행", "1박 2일", "2박 3일", "3박 이상"], default=[], key="trip_days")
-scenery = st.multiselect("질문 5: 선호 풍경/환경은 무엇인가요?", ["바다", "산", "도시"], default=[], key="scenery")
-activities = st.multiselect("질문 6: 하고 싶은 활동은 무엇인가요?", ["맛집 탐방", "카페 투어", "사진 스팟", "온천,스파", "역사,문화", "전시, 뮤지엄", "테마파크"], default=[], key="activities")
-crowd = st.multiselect("질문 7: 혼잡도 선호는 어떤가요?", ["사람 많은 핫플", "조용하고 한적한 곳"], default=[], key="crowd")
+SURVEY_QUESTIONS = [
+    ("purpose", "질문 1: 여행 목적은 무엇인가요?", ["힐링", "휴양", "액티비티", "관광"]),
+    ("companion", "질문 2: 여행의 동반자는 누구인가요?", ["혼자", "연인", "가족", "친구"]),
+    ("transport", "질문 3: 이동수단은 어떻게 되나요?", ["고속버스", "기차", "자동차", "비행기"]),
+    ("trip_days", "질문 4: 여행 기간은 어떻게 되나요?", ["당일여행", "1박 2일", "2박 3일", "3박 이상"]),
+    ("scenery", "질문 5: 선호 풍경/환경은 무엇인가요?", ["바다", "산", "도시"]),
+    ("activities", "질문 6: 하고 싶은 활동은 무엇인가요?", ["맛집 탐방", "카페 투어", "사진 스팟", "온천,스파", "역사,문화", "전시, 뮤지엄", "테마파크"]),
+    ("crowd", "질문 7: 혼잡도 선호는 어떤가요?", ["사람 많은 핫플", "조용하고 한적한 곳"]),
+]
+
+def answer(key: str) -> list:
+    # 설문은 fragment 안에서만 다시 그려지므로, 모듈 변수 대신 항상 session_state에서 현재 값을 읽는다
+    return list(st.session_state.get(key) or [])
 
+# 설문 선택은 이 fragment만 다시 실행(채팅/결과 카드는 그대로)
+@st.fragment
+@timed("survey")
+def survey_section():
+    for key, label, options in SURVEY_QUESTIONS:
+        st.multiselect(label, options, default=[], key=key)
+
+survey_section()
 st.divider()
 
 # =========================================================
@@ -100,137 +167,42 @@ def join_or_none(values: list) -> str:
     return ", ".join(values) if values else "선택 없음"
 
 def validate_min_one_each() -> bool:
-    return bool(scenery) and bool(transport) and bool(trip_days)
+    return bool(answer("scenery")) and bool(answer("transport")) and bool(answer("trip_days"))
 
 def build_chat_summary(messages: list) -> str:
-    user_msgs = [m["content"] for m in messages if m["role"] == "user"]
-    return " / ".join(user_msgs[-3:]) if user_msgs else "추가 입력 없음"
-
-# =========================================================
-# OpenAI safe call
-# =========================================================
-def safe_openai_chat_create(client: OpenAI, **kwargs):
-    max_retries = 3
-    base_sleep = 1.3
-    last_err = None
-    for attempt in range(max_retries):
-        try:
-            return client.chat.completions.create(**kwargs)
-        except (APIConnectionError, APITimeoutError, RateLimitError, APIError) as e:
-            last_err = e
-            time.sleep(base_sleep * (2 ** attempt))
-    raise last_err
-
-# =========================================================
-# TourAPI
-# =========================================================
-def tourapi_get(endpoint: str, params: dict) -> dict:
-    url = f"{TOUR_BASE}/{endpoint}"
-    base_params = {
-        "serviceKey": TOUR_API_KEY,
-        "MobileOS": "ETC",
-        "MobileApp": "MyTravelApp",
-        "_type": "json",
-    }
-    base_params.update(params)
-
-    r = requests.get(url, params=base_params, timeout=25)
-    r.raise_for_status()
-    return r.json()
-
-def safe_items(data: dict) -> list:
-    try:
-        items = data["response"]["body"]["items"]["item"]
-        if isinstance(items, dict):
-            return [items]
-        return items
-    except Exception:
-        return []
-
-def fetch_spots_by_area(area_code: int, limit: int = 180) -> list:
-    data = tourapi_get(
-        "areaBasedList2",
-        {
-            "areaCode": area_code,
-            "contentTypeId": CONTENT_TYPE_TOUR,
-            "numOfRows": limit,
-            "pageNo": 1,
-            "arrange": "P",
-        },
+    memory = st.session_state.memory
+    memory.update(messages)
+    return memory.brief(messages)
+
+def build_chat_context(messages: list) -> list:
+    # 전체 기록 대신: 요약(예산/출발지/일정...) + 토큰 예산 안의 최근 대화
+    memory = st.session_state.memory
+    memory.update(messages)
+    return memory.context_messages(messages)
+
+def build_survey_brief() -> str:
+    return (
+        f"풍경={join_or_none(answer('scenery'))} / 교통={join_or_none(answer('transport'))} / 기간={join_or_none(answer('trip_days'))} / "
+        f"목적={join_or_none(answer('purpose'))} / 활동={join_or_none(answer('activities'))} / 혼잡도={join_or_none(answer('crowd'))}"
     )
-    return safe_items(data)
-
-def filter_spots_with_images(spots: list) -> list:
-    return [s for s in spots if (s.get("firstimage") or s.get("firstimage2"))]
 
 # =========================================================
-# Priority Rules: 1) 풍경 2) 교통 3) 기타
+# OpenAI safe call
 # =========================================================
-ISLAND_KEYWORDS = [
-    "울릉", "독도", "백령", "연평", "가파", "마라도", "추자", "흑산", "홍도", "비양", "청산도", "거문도",
-    "울릉군", "옹진군"
-]
+@st.cache_resource(show_spinner=False)
+def get_openai_client(api_key: str):
+    from openai import OpenAI  # 키가 있고 실제로 호출할 때만 import (첫 로딩 0.5초+ 절약)
+    # 키별로 클라이언트 1개를 프로세스 전체에서 재사용(커넥션 풀 공유, 스레드 안전)
+    # 재시도는 llm.safe_openai_chat_create가 deadline 안에서만 → SDK 자체 재시도는 끔
+    return OpenAI(api_key=api_key, max_retries=0)
 
-SEA_HINTS = ["해변", "바다", "해수욕장", "항", "포구", "등대", "해안", "갯벌", "선착장", "해안도로", "바닷길"]
-MOUNTAIN_HINTS = ["산", "등산", "트레킹", "케이블카", "계곡", "정상", "국립공원", "숲", "오름", "둘레길"]
-CITY_HINTS = ["도심", "시내", "거리", "광장", "전망대", "타워", "야경", "시장", "쇼핑", "문화", "전시", "뮤지엄", "박물관"]
-
-def text_of(spot: dict) -> str:
-    return f"{(spot.get('title') or '')} {(spot.get('addr1') or '')}"
-
-def transport_filter(spots: list, transport_list: list) -> list:
-    t = set(transport_list)
-    if (("기차" in t) or ("고속버스" in t)) and ("비행기" not in t):
-        out = []
-        for s in spots:
-            if any(k in text_of(s) for k in ISLAND_KEYWORDS):
-                continue
-            out.append(s)
-        return out
-    return spots
-
-def scenery_match_score(spot: dict, scenery_list: list) -> int:
-    txt = text_of(spot)
-    chosen = set(scenery_list)
-    score = 0
-    if "바다" in chosen:
-        score += sum(1 for h in SEA_HINTS if h in txt) * 10
-    if "산" in chosen:
-        score += sum(1 for h in MOUNTAIN_HINTS if h in txt) * 10
-    if "도시" in chosen:
-        score += sum(1 for h in CITY_HINTS if h in txt) * 8
-    return score
-
-def scenery_strict_filter(spots: list, scenery_list: list) -> list:
-    if not scenery_list:
-        return spots
-    scored = [(scenery_match_score(s, scenery_list), s) for s in spots]
-    scored.sort(key=lambda x: x[0], reverse=True)
-
-    nonzero = [s for sc, s in scored if sc > 0]
-    if len(nonzero) >= 20:
-        return nonzero
-    return [s for _, s in scored[:70]]
-
-def other_preference_bonus(spot: dict) -> int:
-    # 3순위(보조): 아주 약하게만
-    txt = text_of(spot)
-    bonus = 0
-    if "사진 스팟" in activities and any(k in txt for k in ["전망", "포토", "타워", "전망대"]):
-        bonus += 2
-    if "역사,문화" in activities and any(k in txt for k in ["성", "궁", "박물관", "유적", "문화", "사찰"]):
-        bonus += 2
-    if "온천,스파" in activities and any(k in txt for k in ["온천", "스파", "탕"]):
-        bonus += 2
-    if "테마파크" in activities and any(k in txt for k in ["테마파크", "랜드", "월드"]):
-        bonus += 2
-    return bonus
-
-def total_rank_score(spot: dict, scenery_list: list) -> int:
-    # 풍경이 1순위 → 가중치 압도적으로
-    scenic = scenery_match_score(spot, scenery_list) * 25
-    bonus = other_preference_bonus(spot)  # 보조
-    return scenic + bonus
+def extract_json_object(text: str) -> dict:
+    text = text.strip()
+    start = text.find("{")
+    end = text.rfind("}")
+    if start != -1 and end != -1 and end > start:
+        text = text[start : end + 1]
+    return json.loads(text)
 
 # =========================================================
 # Plan fallback (OpenAI 없어도 작동)
@@ -238,13 +210,13 @@ def total_rank_score(spot: dict, scenery_list: list) -> int:
 def local_plan_fallback():
     # areaCode 참고: 1 서울, 2 인천, 3 대전, 4 대구, 5 광주, 6 부산, 7 울산, 8 세종,
     # 31 경기, 32 강원, 33 충북, 34 충남, 35 경북, 36 경남, 37 전북, 38 전남, 39 제주
-    if "바다" in scenery:
+    if "바다" in answer("scenery"):
         return {"areas": [{"name": "부산", "areaCode": 6}, {"name": "강원", "areaCode": 32}, {"name": "경남", "areaCode": 36}, {"name": "전남", "areaCode": 38}], "style_summary": "바다 선호"}
-    if "산" in scenery:
+    if "산" in answer("scenery"):
         return {"areas": [{"name": "강원", "areaCode": 32}, {"name": "경북", "areaCode": 35}, {"name": "충북", "areaCode": 33}, {"name": "경기", "areaCode": 31}], "style_summary": "산 선호"}
     return {"areas": [{"name": "서울", "areaCode": 1}, {"name": "부산", "areaCode": 6}, {"name": "대구", "areaCode": 4}, {"name": "인천", "areaCode": 2}], "style_summary": "도시 선호"}
 
-def extract_recommendation_plan(client: OpenAI, survey_context: str, chat_messages: list) -> dict:
+def extract_recommendation_plan(client, survey_context: str, chat_messages: list, deadline: Deadline = None) -> dict:
     system_prompt = """
 너는 국내 여행지 추천을 위한 플래너야.
 JSON으로만 출력해.
@@ -254,67 +226,124 @@ areas는 4~6개 정도로 넓게 제안해.
     messages_for_api.append({"role": "system", "content": survey_context})
     messages_for_api.extend(chat_messages)
 
-    res = safe_openai_chat_create(client, model="gpt-4o-mini", messages=messages_for_api, temperature=0.2)
-    text = res.choices[0].message.content.strip()
+    res = safe_openai_chat_create(client, deadline, model="gpt-4o-mini", messages=messages_for_api, temperature=0.2)
+    return validate_plan(extract_json_object(res.choices[0].message.content))
+
+POOL_SIZE = 30
+RANK_ENGINE = os.getenv("RANK_ENGINE", "vector")  # vector | python
+RANK_SCORER = os.getenv("RANK_SCORER", "keyword")  # keyword | ngram (문자 n-gram TF-IDF 유사도)
+# 오타(예: ngarm)가 조용히 기본값으로 바뀌지 않게 바로 멈춘다
+if RANK_ENGINE not in RANK_ENGINES or RANK_SCORER not in RANK_SCORERS:
+    st.error(f"RANK_ENGINE={RANK_ENGINE!r} / RANK_SCORER={RANK_SCORER!r} — 가능한 값: {' | '.join(RANK_ENGINES)} / {' | '.join(RANK_SCORERS)}")
+    st.stop()
+
+def compact_spot(spot, travel=None) -> Spot:
+    # 세션에는 Spot(필요한 필드만, intern된 문자열)으로 보관
+    spot = Spot.from_item(spot)
+    if travel is not None:
+        hours = spot_travel_hours(spot, travel)
+        if math.isfinite(hours):  # nan(좌표 없음) / inf(갈 수 없는 조합, 예: 제주 ↔ 육지 기차)면 표시하지 않음
+            return spot.with_travel_hours(round(hours, 1))
+    return spot
+
+def travel_model():
+    # 대화에서 뽑은 출발지 + 이동수단 + 기간 → 이동 시간 모델 (출발지를 모르면 None)
+    memory = st.session_state.memory
+    memory.update(st.session_state.messages)
+    return TravelModel.build(memory.facts.get("origin"), answer("transport"), answer("trip_days"))
+
+def survey_answers() -> dict:
+    return {
+        "scenery": sorted(answer("scenery")),
+        "transport": sorted(answer("transport")),
+        "trip_days": sorted(answer("trip_days")),
+        "purpose": sorted(answer("purpose")),
+        "activities": sorted(answer("activities")),
+        "crowd": sorted(answer("crowd")),
+    }
 
-    start = text.find("{")
-    end = text.rfind("}")
-    if start != -1 and end != -1 and end > start:
-        text = text[start : end + 1]
-    return json.loads(text)
+def survey_fingerprint(plan: dict) -> str:
+    travel = travel_model()
+    payload = {
+        "areas": [a.get("areaCode") for a in plan.get("areas", [])[:6]],
+        "origin": travel.origin if travel else None,
+        **survey_answers(),
+    }
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
 
-def pick_3_spots_strict_priority(plan: dict, seed: int) -> list:
-    rng = random.Random(seed)
+def build_ranked_pool(plan: dict) -> list:
     areas = plan.get("areas", [])[:6]
     if not areas:
         areas = local_plan_fallback().get("areas", [])
 
-    pool, seen = [], set()
-    for area in areas:
-        code = area.get("areaCode")
-        if not code:
-            continue
-        spots = filter_spots_with_images(fetch_spots_by_area(code, limit=180))
-        spots = transport_filter(spots, transport)        # 2순위
-        spots = scenery_strict_filter(spots, scenery)     # 1순위(엄격)
-        for s in spots:
-            cid = s.get("contentid")
-            if not cid or cid in seen:
-                continue
-            seen.add(cid)
-            pool.append(s)
-
-    if not pool:
-        return []
-
-    ranked = sorted(pool, key=lambda s: total_rank_score(s, scenery), reverse=True)
-    top = ranked[:80] if len(ranked) > 80 else ranked
-
-    if len(top) <= 3:
-        return top
+    # 지역별 TourAPI 요청은 동시에 → 지연 시간 ≈ 가장 느린 한 지역
+    # 지역마다 페이지 단위로 받다가, 조건에 맞는 후보가 충분하면 더 받지 않음
+    # 출발지를 알면 여행 기간 안에 못 가는 지역은 아예 받지 않음(전부 멀면 그대로)
+    travel = travel_model()
+    codes = [area.get("areaCode") for area in areas]
+    if travel is not None:
+        codes = [code for code in codes if travel.area_reachable(code)] or codes
+    with span("fetch", areas=len(codes)) as attrs:
+        fetched = fetch_areas_concurrently(
+            codes,
+            TOUR_API_KEY,
+            limit=STREAM_PAGE_SIZE,
+            max_rows=STREAM_MAX_ROWS,
+            stop_when=lambda: early_stop_rule(answer("transport"), answer("scenery"), travel=travel),
+        )
+        attrs["rows"] = sum(len(v) for v in fetched.values())
+
+    spots_by_area = [fetched[code] for code in dict.fromkeys(codes) if code in fetched]
+
+    # 인기 후보에 상세 개요/분류를 붙여 풍경 점수를 보강 (정해진 시간 안에 온 것만, 나머지는 캐시에 쌓여 다음 클릭에)
+    with span("enrich") as attrs:
+        attrs["enriched"] = enrich_spots(enrichment_shortlist(spots_by_area, answer("transport"), ENRICH_PER_AREA, travel), TOUR_API_KEY)
+
+    # 이미지 → 교통(2순위, 출발지 기준 도달 가능) → 풍경(1순위, 엄격) 필터 후 전체 랭킹(이동 시간 감점), 상위 30에서만 샘플링
+    with span("rank", engine=RANK_ENGINE, scorer=RANK_SCORER) as attrs:
+        ranked = rank_pool(spots_by_area, answer("transport"), answer("scenery"), answer("activities"), top_k=POOL_SIZE, engine=RANK_ENGINE, travel=travel, scorer=RANK_SCORER)
+        attrs["pool"] = len(ranked)
+    return [compact_spot(s, travel) for s in ranked]
+
+def sample_spots(ranked: list, seed: int) -> list:
+    if len(ranked) <= 3:
+        return list(ranked)
+    rng = random.Random(seed)
+    return rng.sample(ranked[:POOL_SIZE], 3)
 
-    # 상위 30에서만 샘플링
-    return rng.sample(top[:30], 3)
+def pick_3_spots_strict_priority(plan: dict, seed: int) -> list:
+    return sample_spots(build_ranked_pool(plan), seed)
 
 # =========================================================
 # Reason fallback
 # =========================================================
 def local_reason_fallback(spot_title: str) -> str:
-    s = ", ".join(scenery) if scenery else "선호 풍경"
-    t = ", ".join(transport) if transport else "선호 이동수단"
-    d = ", ".join(trip_days) if trip_days else "여행 기간"
+    s = ", ".join(answer("scenery")) if answer("scenery") else "선호 풍경"
+    t = ", ".join(answer("transport")) if answer("transport") else "선호 이동수단"
+    d = ", ".join(answer("trip_days")) if answer("trip_days") else "여행 기간"
     return f"{spot_title}은(는) '{s}' 분위기를 즐기기 좋고, '{t}' 기준으로 접근하기 쉬운 편이라 '{d}' 일정에 잘 맞아요."
 
-def generate_reason_for_spot(openai_key: str, survey_brief: str, chat_summary: str, spot_title: str, spot_addr: str) -> str:
-    client = OpenAI(api_key=openai_key)
-    prompt = f"""
-추천 이유를 1~2문장으로 아주 깔끔하게 작성해줘.
+# stream: 카드를 먼저 그리고 이유는 토큰 단위로 채움 / parallel: 장소별 호출을 동시에 /
+# batch: 한 번의 호출로 3곳 이유를 JSON으로
+REASON_MODE = os.getenv("REASON_MODE", "stream")
+REASON_DEADLINE_SEC = 15.0
+# 클릭 1번이 OpenAI(플랜 + 이유)에 쓸 수 있는 전체 시간 / 채팅 응답 1번
+LLM_BUDGET_SEC = 20.0
+REASON_STREAM_REFRESH_SEC = 0.08
+CHAT_BUDGET_SEC = 15.0
 
+REASON_RULES = """
 필수:
 - 풍경(1순위) + 이동수단(2순위)을 반드시 반영
 - 사용자가 선택하지 않은 교통수단(비행기/배/렌터카)을 전제로 말하지 말 것
 - 관광지 이름 포함, 최대 2문장
+"""
 
+def reason_messages(survey_brief: str, chat_summary: str, spot_title: str, spot_addr: str) -> list:
+    prompt = f"""
+추천 이유를 1~2문장으로 아주 깔끔하게 작성해줘.
+{REASON_RULES}
 [사용자 선호(요약)]
 {survey_brief}
 
@@ -324,17 +353,136 @@ def generate_reason_for_spot(openai_key: str, survey_brief: str, chat_summary: s
 [관광지]
 - 이름: {spot_title}
 - 주소: {spot_addr}
+"""
+    return [
+        {"role": "system", "content": "너는 짧고 깔끔하게 말하는 여행 추천 AI야."},
+        {"role": "user", "content": prompt},
+    ]
+
+def generate_reason_for_spot(client, survey_brief: str, chat_summary: str, spot_title: str, spot_addr: str, deadline: Deadline = None) -> str:
+    with span("reason", title=spot_title):
+        res = safe_openai_chat_create(
+            client,
+            deadline,
+            model="gpt-4o-mini",
+            messages=reason_messages(survey_brief, chat_summary, spot_title, spot_addr),
+            temperature=0.3,
+        )
+    return res.choices[0].message.content.strip()
+
+def generate_reasons_batched(client, survey_brief: str, chat_summary: str, spots: list, deadline: Deadline = None) -> dict:
+    spot_lines = "\n".join(
+        f"- contentid={s.get('contentid', '')} / 이름: {s.get('title', '')} / 주소: {s.get('addr1', '')}" for s in spots
+    )
+    prompt = f"""
+아래 관광지 각각에 대해 추천 이유를 1~2문장으로 아주 깔끔하게 작성해줘.
+{REASON_RULES}
+출력 형식(JSON만): {{"reasons": {{"<contentid>": "<추천 이유>", ...}}}}
+
+[사용자 선호(요약)]
+{survey_brief}
+
+[추가 입력 요약]
+{chat_summary}
+
+[관광지]
+{spot_lines}
 """
     res = safe_openai_chat_create(
         client,
+        deadline,
         model="gpt-4o-mini",
         messages=[
-            {"role": "system", "content": "너는 짧고 깔끔하게 말하는 여행 추천 AI야."},
+            {"role": "system", "content": "너는 짧고 깔끔하게 말하는 여행 추천 AI야. JSON으로만 출력해."},
             {"role": "user", "content": prompt},
         ],
         temperature=0.3,
+        response_format={"type": "json_object"},
     )
-    return res.choices[0].message.content.strip()
+    reasons = extract_json_object(res.choices[0].message.content).get("reasons", {})
+    return {str(k): str(v).strip() for k, v in reasons.items() if v}
+
+def reason_streaming_enabled() -> bool:
+    return REASON_MODE == "stream" and bool(OPENAI_API_KEY) and openai_healthy()
+
+def generate_reasons(spots: list, survey_brief: str, chat_summary: str, deadline: Deadline = None) -> dict:
+    # 실패/시간 초과한 장소만 개별적으로 local_reason_fallback (OpenAI 장애 중이면 바로 전부 fallback)
+    deadline = deadline or Deadline(REASON_DEADLINE_SEC)
+    reasons = {}
+    if OPENAI_API_KEY and spots and openai_healthy():
+        client = get_openai_client(OPENAI_API_KEY)
+        if REASON_MODE == "batch":
+            try:
+                with span("reason.batch", spots=len(spots)):
+                    reasons = generate_reasons_batched(client, survey_brief, chat_summary, spots, deadline)
+            except Exception:
+                reasons = {}
+        else:
+            pool = ThreadPoolExecutor(max_workers=len(spots), thread_name_prefix="reason")
+            try:
+                futures = {
+                    pool.submit(bind(generate_reason_for_spot), client, survey_brief, chat_summary, s.get("title", ""), s.get("addr1", ""), deadline): s.get("contentid", "")
+                    for s in spots
+                }
+                done, _ = wait(futures, timeout=min(REASON_DEADLINE_SEC, deadline.remaining()))
+            finally:
+                pool.shutdown(wait=False, cancel_futures=True)
+            for fut in done:
+                if fut.exception() is None and fut.result():
+                    reasons[futures[fut]] = fut.result()
+
+    out = {}
+    for spot in spots:
+        cid = spot.get("contentid", "")
+        if not reasons.get(cid):
+            count("fallback.reason")
+        out[cid] = reasons.get(cid) or local_reason_fallback(spot.get("title", ""))
+    return out
+
+def stream_reasons(slots: dict, spots: list, survey_brief: str, chat_summary: str, deadline: Deadline = None) -> dict:
+    # 장소별 스트리밍은 작업 스레드에서 받고, 화면 갱신(st.*)은 스크립트 스레드에서만 한다
+    deadline = deadline or Deadline(REASON_DEADLINE_SEC)
+    client = get_openai_client(OPENAI_API_KEY)
+    buffers = {spot.get("contentid", ""): [] for spot in spots}
+
+    def consume(spot: dict) -> str:
+        parts = buffers[spot.get("contentid", "")]
+        with span("reason", title=spot.get("title", ""), stream=True):
+            for delta in stream_openai_chat(
+                client,
+                deadline,
+                model="gpt-4o-mini",
+                messages=reason_messages(survey_brief, chat_summary, spot.get("title", ""), spot.get("addr1", "")),
+                temperature=0.3,
+            ):
+                parts.append(delta)
+        return "".join(parts).strip()
+
+    pool = ThreadPoolExecutor(max_workers=len(spots), thread_name_prefix="reason-stream")
+    futures = {spot.get("contentid", ""): pool.submit(bind(consume), spot) for spot in spots}
+    shown = {cid: 0 for cid in futures}
+    try:
+        while not deadline.expired:
+            for cid, parts in buffers.items():
+                if len(parts) != shown[cid] and not futures[cid].done():
+                    shown[cid] = len(parts)
+                    slots[cid].markdown(f'<div class="spot-reason">{"".join(parts)}▌</div>', unsafe_allow_html=True)
+            if all(f.done() for f in futures.values()):
+                break
+            wait(futures.values(), timeout=REASON_STREAM_REFRESH_SEC)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    out = {}
+    for spot in spots:
+        cid = spot.get("contentid", "")
+        fut = futures[cid]
+        text = fut.result() if fut.done() and fut.exception() is None else ""
+        if not text:
+            count("fallback.reason")
+        out[cid] = text or local_reason_fallback(spot.get("title", ""))
+        slots[cid].markdown(f'<div class="spot-reason">{out[cid]}</div>', unsafe_allow_html=True)
+    return out
 
 # =========================================================
 # Map links (vertical)
@@ -352,10 +500,11 @@ def render_map_links_vertical(title: str, lat, lng):
 # =========================================================
 # Card UI
 # =========================================================
-def render_spot_card(spot: dict, reason: str):
+def render_spot_card(spot: Spot, reason: str):
+    # reason이 None이면 이유 자리를 비워 두고 그 placeholder를 돌려준다(스트리밍으로 채움)
     title = spot.get("title", "이름 없음")
     addr = spot.get("addr1", "")
-    img = spot.get("firstimage") or spot.get("firstimage2")
+    img = card_image(spot.get("firstimage") or spot.get("firstimage2"))
     lat = spot.get("mapy")
     lng = spot.get("mapx")
 
@@ -368,66 +517,78 @@ def render_spot_card(spot: dict, reason: str):
     if addr:
         st.markdown(f'<div class="spot-addr">{addr}</div>', unsafe_allow_html=True)
 
-    st.markdown(f'<div class="spot-reason">{reason}</div>', unsafe_allow_html=True)
+    slot = st.empty()
+    if reason is None:
+        slot.markdown('<div class="spot-reason">추천 이유를 쓰는 중... ✍️</div>', unsafe_allow_html=True)
+    else:
+        slot.markdown(f'<div class="spot-reason">{reason}</div>', unsafe_allow_html=True)
 
     st.markdown("<div class='tagbox'>", unsafe_allow_html=True)
-    st.markdown(f"<span class='tag'>🌄 풍경(1순위): {', '.join(scenery)}</span>", unsafe_allow_html=True)
-    st.markdown(f"<span class='tag'>🚆 이동수단(2순위): {', '.join(transport)}</span>", unsafe_allow_html=True)
-    if trip_days:
-        st.markdown(f"<span class='tag'>🗓️ 기간: {', '.join(trip_days)}</span>", unsafe_allow_html=True)
+    st.markdown(f"<span class='tag'>🌄 풍경(1순위): {', '.join(answer('scenery'))}</span>", unsafe_allow_html=True)
+    st.markdown(f"<span class='tag'>🚆 이동수단(2순위): {', '.join(answer('transport'))}</span>", unsafe_allow_html=True)
+    if answer("trip_days"):
+        st.markdown(f"<span class='tag'>🗓️ 기간: {', '.join(answer('trip_days'))}</span>", unsafe_allow_html=True)
+    if spot.get("travel_hours") is not None:
+        st.markdown(f"<span class='tag'>⏱️ 출발지에서 편도 약 {spot['travel_hours']}시간</span>", unsafe_allow_html=True)
     st.markdown("</div>", unsafe_allow_html=True)
 
     render_map_links_vertical(title, lat, lng)
+    return slot
 
 # =========================================================
 # Chat UI
 # =========================================================
-st.subheader("💬 추가 정보 입력 (예산/출발지/특이사항)")
-for msg in st.session_state.messages:
-    with st.chat_message(msg["role"]):
-        st.write(msg["content"])
+# 채팅은 이 fragment만 다시 실행(설문/결과 카드는 그대로)
+@st.fragment
+@timed("chat")
+def chat_section():
+    st.subheader("💬 추가 정보 입력 (예산/출발지/특이사항)")
+    for msg in st.session_state.messages:
+        with st.chat_message(msg["role"]):
+            st.write(msg["content"])
 
-user_input = st.chat_input("예: 예산 20만원, 서울 출발, 1박2일, 바다+맛집 위주!")
+    user_input = st.chat_input("예: 예산 20만원, 서울 출발, 1박2일, 바다+맛집 위주!")
 
-if user_input:
-    st.session_state.messages.append({"role": "user", "content": user_input})
-    with st.chat_message("user"):
-        st.write(user_input)
+    if user_input:
+        st.session_state.messages.append({"role": "user", "content": user_input})
+        with st.chat_message("user"):
+            st.write(user_input)
 
-    # 여기서는 정보수집용이니까 OpenAI 없어도 에러 안내만
-    if not OPENAI_API_KEY:
-        with st.chat_message("assistant"):
-            st.info("OpenAI 키를 넣으면 대화 기반 정보 수집을 더 잘 할 수 있어요! (지금은 설문 기반 추천만 가능)")
-    else:
-        # 간단 응답(스트리밍 없이도 OK) — 안정성을 위해 try/except
-        try:
-            client = OpenAI(api_key=OPENAI_API_KEY)
-            system_prompt_chat = """
+        # 여기서는 정보수집용이니까 OpenAI 없어도 에러 안내만
+        if not OPENAI_API_KEY:
+            with st.chat_message("assistant"):
+                st.info("OpenAI 키를 넣으면 대화 기반 정보 수집을 더 잘 할 수 있어요! (지금은 설문 기반 추천만 가능)")
+        else:
+            # 토큰 단위 스트리밍 응답 — 안정성을 위해 try/except
+            try:
+                client = get_openai_client(OPENAI_API_KEY)
+                system_prompt_chat = """
 너는 국내 여행지 추천을 위한 정보 수집용 챗봇이야.
 예산/출발지/제약을 파악하고 부족한 정보가 있으면 질문해.
 중요: 지금은 장소 추천하지 말고 정보 수집만 해.
 """
-            survey_context_chat = f"""
+                survey_context_chat = f"""
 [현재 사용자의 선택]
-- 선호 풍경(1순위): {join_or_none(scenery)}
-- 이동수단(2순위): {join_or_none(transport)}
-- 기간: {join_or_none(trip_days)}
+- 선호 풍경(1순위): {join_or_none(answer('scenery'))}
+- 이동수단(2순위): {join_or_none(answer('transport'))}
+- 기간: {join_or_none(answer('trip_days'))}
 """
-            messages_for_api = [{"role": "system", "content": system_prompt_chat}]
-            messages_for_api.append({"role": "system", "content": survey_context_chat})
-            messages_for_api.extend(st.session_state.messages)
+                messages_for_api = [{"role": "system", "content": system_prompt_chat}]
+                messages_for_api.append({"role": "system", "content": survey_context_chat})
+                messages_for_api.extend(build_chat_context(st.session_state.messages))
 
-            res = safe_openai_chat_create(client, model="gpt-4o-mini", messages=messages_for_api, temperature=0.4)
-            assistant_text = res.choices[0].message.content.strip()
+                with st.chat_message("assistant"):
+                    assistant_text = st.write_stream(
+                        stream_openai_chat(client, Deadline(CHAT_BUDGET_SEC), model="gpt-4o-mini", messages=messages_for_api, temperature=0.4)
+                    )
 
-            with st.chat_message("assistant"):
-                st.write(assistant_text)
+                st.session_state.messages.append({"role": "assistant", "content": str(assistant_text).strip()})
 
-            st.session_state.messages.append({"role": "assistant", "content": assistant_text})
+            except Exception:
+                with st.chat_message("assistant"):
+                    st.info("지금은 네트워크가 불안정해서 대화 기능이 잠시 멈췄어요. 설문 기반 추천은 계속 사용할 수 있어요!")
 
-        except Exception:
-            with st.chat_message("assistant"):
-                st.info("지금은 네트워크가 불안정해서 대화 기능이 잠시 멈췄어요. 설문 기반 추천은 계속 사용할 수 있어요!")
+chat_section()
 
 # =========================================================
 # Recommendation Pipeline (🔥 여기가 핵심: OpenAI 실패해도 앱 계속)
@@ -435,91 +596,174 @@ if user_input:
 def generate_recommendations():
     survey_context = f"""
 [선호도 조사]
-- 선호 풍경/환경(1순위): {join_or_none(scenery)}
-- 이동수단(2순위): {join_or_none(transport)}
-- 기간: {join_or_none(trip_days)}
-- 목적: {join_or_none(purpose)}
-- 활동: {join_or_none(activities)}
-- 혼잡도: {join_or_none(crowd)}
+- 선호 풍경/환경(1순위): {join_or_none(answer('scenery'))}
+- 이동수단(2순위): {join_or_none(answer('transport'))}
+- 기간: {join_or_none(answer('trip_days'))}
+- 목적: {join_or_none(answer('purpose'))}
+- 활동: {join_or_none(answer('activities'))}
+- 혼잡도: {join_or_none(answer('crowd'))}
 """
 
-    # 1) plan: OpenAI 시도 → 실패하면 local fallback
-    plan = None
-    if OPENAI_API_KEY:
-        try:
-            client = OpenAI(api_key=OPENAI_API_KEY)
-            plan = extract_recommendation_plan(client, survey_context, st.session_state.messages)
-        except Exception:
-            plan = local_plan_fallback()
-            st.info("OpenAI 연결이 불안정해서, 임시로 로컬 규칙 기반으로 추천을 만들었어요.")
-    else:
-        plan = local_plan_fallback()
-
-    # 2) spot 선정: 풍경 1순위 + 교통 2순위로 엄격 랭킹
-    spots = pick_3_spots_strict_priority(plan, seed=st.session_state.rerun_seed)
-
-    # 3) reason: OpenAI 시도 → 실패하면 템플릿 fallback
-    chat_summary = build_chat_summary(st.session_state.messages)
-    survey_brief = (
-        f"풍경={join_or_none(scenery)} / 교통={join_or_none(transport)} / 기간={join_or_none(trip_days)} / "
-        f"목적={join_or_none(purpose)} / 활동={join_or_none(activities)} / 혼잡도={join_or_none(crowd)}"
-    )
-
-    reasons = {}
-    for spot in spots:
-        cid = spot.get("contentid", "")
-        title = spot.get("title", "")
-        addr = spot.get("addr1", "")
-        if OPENAI_API_KEY:
+    # 1) plan: OpenAI 시도 → 실패하면 local fallback (플랜 + 이유가 같은 deadline을 나눠 씀)
+    #    같은 설문 + 같은 대화 핵심 정보면 다른 세션이 만든 플랜을 재사용(LLM 호출 없음)
+    deadline = Deadline(LLM_BUDGET_SEC)
+    chat_context = build_chat_context(st.session_state.messages)
+    plan_key = plan_fingerprint(survey_answers(), st.session_state.memory.facts)
+    with span("plan") as attrs:
+        plan = plan_cache.get(plan_key) if OPENAI_API_KEY else None
+        attrs["source"] = "cache" if plan is not None else "llm"
+        if plan is None and OPENAI_API_KEY and openai_healthy():
             try:
-                reasons[cid] = generate_reason_for_spot(OPENAI_API_KEY, survey_brief, chat_summary, title, addr)
+                client = get_openai_client(OPENAI_API_KEY)
+                plan = extract_recommendation_plan(client, survey_context, chat_context, deadline)
+                plan_cache.set(plan_key, plan)
             except Exception:
-                reasons[cid] = local_reason_fallback(title)
-        else:
-            reasons[cid] = local_reason_fallback(title)
+                plan = local_plan_fallback()
+                attrs["source"] = "fallback"
+                st.info("OpenAI 연결이 불안정해서, 임시로 로컬 규칙 기반으로 추천을 만들었어요.")
+        elif plan is None and OPENAI_API_KEY:
+            plan = local_plan_fallback()
+            attrs["source"] = "fallback"
+            st.info("OpenAI 연결이 불안정해서, 임시로 로컬 규칙 기반으로 추천을 만들었어요.")
+        elif plan is None:
+            plan = local_plan_fallback()
+            attrs["source"] = "local"
+        count(f"plan.{attrs['source']}")
 
+    # 2) spot 선정: 풍경 1순위 + 교통 2순위로 엄격 랭킹 (후보 풀은 다시 뽑기용으로 보관)
+    ranked = build_ranked_pool(plan)
+    prefetch_thumbnails([s.get("firstimage") or s.get("firstimage2") for s in ranked])  # 이유 생성과 겹치게
     st.session_state.plan = plan
+    st.session_state.pool = {"fingerprint": survey_fingerprint(plan), "spots": ranked}
+    st.session_state.reasons = {}
+    finalize_results(ranked, deadline)
+
+def finalize_results(ranked: list, deadline: Deadline = None):
+    # 다시 뽑기는 플랜 호출이 없으므로 이유에만 새 예산을 쓴다
+    deadline = deadline or Deadline(LLM_BUDGET_SEC)
+    with span("sample", pool=len(ranked)):
+        spots = sample_spots(ranked, seed=st.session_state.rerun_seed)
+
+    # 3) reason: OpenAI 시도 → 실패하면 템플릿 fallback (이미 만든 이유는 재사용)
+    #    stream 모드에서는 비워 두고 결과 카드를 그리면서 채운다
+    reasons = dict(st.session_state.reasons)
+    missing = [spot for spot in spots if spot.get("contentid", "") not in reasons]
+    if not reason_streaming_enabled():
+        chat_summary = build_chat_summary(st.session_state.messages)
+        reasons.update(generate_reasons(missing, build_survey_brief(), chat_summary, deadline))
+
     st.session_state.results = spots
     st.session_state.reasons = reasons
-
-# =========================================================
-# Buttons
-# =========================================================
-st.divider()
-col_a, col_b = st.columns([1, 1])
-with col_a:
-    run_result = st.button("결과 보기", type="primary")
-with col_b:
-    reroll = st.button("🔄 결과 다시 뽑기", type="secondary", help="설문/대화는 그대로 두고 결과만 새로 추천해요.")
-
-if run_result:
-    if not TOUR_API_KEY:
-        st.error("TourAPI ServiceKey를 사이드바에 입력해주세요.")
-        st.stop()
-    if not validate_min_one_each():
-        st.warning("추천을 위해 최소한 '선호풍경/이동수단/여행기간'은 1개 이상 선택해주세요!")
-        st.stop()
-
-    with st.spinner("풍경(1순위) → 이동수단(2순위) 기준으로 장소를 고르는 중... 🌊🚆"):
+    st.session_state.reason_deadline = deadline
+
+def reroll_recommendations():
+    # 설문이 그대로면 보관한 후보 풀에서 다시 샘플링만 (TourAPI/플랜 호출 없음)
+    # 풀이 비어 있으면(지난번 수집 실패/시간 초과) 재사용하지 않고 처음부터 다시 만든다
+    pool = st.session_state.pool
+    plan = st.session_state.plan
+    if not pool or not pool["spots"] or not plan or pool["fingerprint"] != survey_fingerprint(plan):
         generate_recommendations()
-
-if reroll:
-    if st.session_state.results is None:
-        st.warning("먼저 '결과 보기'를 눌러 추천을 생성해 주세요!")
+        return
+    count("pool.reuse")
+    finalize_results(pool["spots"])
+
+# =========================================================
+# Buttons + Results
+# =========================================================
+# 버튼/결과 카드는 이 fragment만 다시 실행 — 설문 선택이나 채팅이 바뀌어도 카드(이미지/지도 버튼)를 다시 그리지 않음
+@st.fragment
+@timed("results")
+def results_section():
+    st.divider()
+    col_a, col_b = st.columns([1, 1])
+    with col_a:
+        run_result = st.button("결과 보기", type="primary")
+    with col_b:
+        reroll = st.button("🔄 결과 다시 뽑기", type="secondary", help="설문/대화는 그대로 두고 결과만 새로 추천해요.")
+
+    # 버튼을 누른 rerun만 trace 1개로 기록(플랜 → 지역별 수집 → 필터/랭킹 → 샘플 → 이유 → 카드)
+    action = "recommend" if run_result else "reroll" if reroll else None
+    with trace(action, on_finish=remember_trace):
+        if run_result:
+            if not TOUR_API_KEY and spot_index is None:
+                st.error("TourAPI ServiceKey를 사이드바에 입력해주세요.")
+                return
+            if not validate_min_one_each():
+                st.warning("추천을 위해 최소한 '선호풍경/이동수단/여행기간'은 1개 이상 선택해주세요!")
+                return
+
+            with st.spinner("풍경(1순위) → 이동수단(2순위) 기준으로 장소를 고르는 중... 🌊🚆"):
+                generate_recommendations()
+
+        if reroll:
+            if st.session_state.results is None:
+                st.warning("먼저 '결과 보기'를 눌러 추천을 생성해 주세요!")
+            else:
+                st.session_state.rerun_seed += 1
+                with st.spinner("풍경(1순위) → 이동수단(2순위) 기준으로 새 추천을 만드는 중... 🔄"):
+                    reroll_recommendations()
+
+        # 결과
+        if st.session_state.results:
+            st.markdown("# 지금 당신에게 딱인 장소는 ...")
+            cols = st.columns(3)
+            pending, slots = [], {}
+            # 카드 크기 썸네일이 준비될 때까지 잠깐(전체 상한) 기다림 — 보통 이유를 만드는 동안 이미 받아져 있음
+            with span("thumbs.wait"):
+                wait_for_thumbnails([s.get("firstimage") or s.get("firstimage2") for s in st.session_state.results])
+            with span("render", cards=len(st.session_state.results)):
+                for i, spot in enumerate(st.session_state.results):
+                    cid = spot.get("contentid", "")
+                    reason = st.session_state.reasons.get(cid)
+                    if reason is None and not reason_streaming_enabled():
+                        reason = "선호도와 입력한 조건에 잘 맞는 장소예요!"
+                    with cols[i]:
+                        slots[cid] = render_spot_card(spot, reason)
+                    if reason is None:
+                        pending.append(spot)
+
+            # 카드(이미지/제목/지도)는 이미 그려졌고, 비어 있는 이유만 스트리밍으로 채움
+            # 같은 클릭의 Deadline을 이어서 쓴다(플랜에 쓴 시간만큼 줄어 있음) — 한 번 쓰고 비움
+            if pending:
+                chat_summary = build_chat_summary(st.session_state.messages)
+                deadline, st.session_state.reason_deadline = st.session_state.reason_deadline, None
+                st.session_state.reasons.update(stream_reasons(slots, pending, build_survey_brief(), chat_summary, deadline))
+
+results_section()
+
+# =========================================================
+# Rerun timing (사이드바)
+# =========================================================
+record_rerun_time("page", PAGE_STARTED)
+with st.sidebar.expander("⏱️ rerun 시간 (최근)"):
+    st.caption(" · ".join(f"{name} {ms:.0f}ms" for name, ms in reversed(st.session_state.rerun_times)))
+
+# =========================================================
+# Debug panel (사이드바, 선택)
+# =========================================================
+# fragment 안에서는 사이드바를 그릴 수 없어서 전체 rerun 때 갱신된다 → 새로고침 버튼
+def render_debug_panel():
+    traces = st.session_state.traces
+    st.sidebar.button("새로고침", key="debug_refresh")
+    if not traces:
+        st.sidebar.caption("아직 기록된 클릭이 없어요. '결과 보기'를 눌러 보세요.")
     else:
-        st.session_state.rerun_seed += 1
-        with st.spinner("풍경(1순위) → 이동수단(2순위) 기준으로 새 추천을 만드는 중... 🔄"):
-            generate_recommendations()
-        st.rerun()
-
-# =========================================================
-# Results
-# =========================================================
-if st.session_state.results:
-    st.markdown("# 지금 당신에게 딱인 장소는 ...")
-    cols = st.columns(3)
-    for i, spot in enumerate(st.session_state.results):
-        cid = spot.get("contentid", "")
-        reason = st.session_state.reasons.get(cid, "선호도와 입력한 조건에 잘 맞는 장소예요!")
-        with cols[i]:
-            render_spot_card(spot, reason)
+        last = traces[-1]
+        st.sidebar.markdown(f"**마지막 클릭: {last['name']} — {last['total_ms']:.0f}ms**")
+        st.sidebar.dataframe(
+            [{"단계": s["name"], "ms": s["ms"], "속성": ", ".join(f"{k}={v}" for k, v in s.items() if k not in ("name", "ms"))} for s in last["spans"]],
+            hide_index=True,
+        )
+        if last["counters"]:
+            st.sidebar.caption(" · ".join(f"{k} {v}" for k, v in sorted(last["counters"].items())))
+
+    recent = recent_traces()
+    if recent:
+        st.sidebar.markdown(f"**프로세스 전체 최근 {len(recent)}회 (p50 / p95)**")
+        st.sidebar.dataframe(
+            [{"단계": name, "n": n, "p50 ms": round(p50, 1), "p95 ms": round(p95, 1)} for name, (n, p50, p95) in stage_percentiles(recent).items()],
+            hide_index=True,
+        )
+
+if st.sidebar.toggle("🛠️ 디버그 패널", value=DEBUG_PANEL, key="debug_panel"):
+    render_debug_panel()
@@ -0,0 +1,182 @@
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import threading
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "app.py")
+sys.path.insert(0, ROOT)
+import stub_openai
+import stub_tourapi
+
+# =========================================================
+# Multi-session load test (AppTest로 app.py를 여러 세션이 동시에 실행)
+# =========================================================
+# - 로컬 TourAPI/OpenAI 스텁을 띄우고(키 없이), 세션마다 설문 선택 → "결과 보기" → "다시 뽑기"
+# - 동시 세션 수(concurrency)별로 클릭 지연 p50/p95/max, 처리량(클릭/초), 최대 RSS를 출력
+# - 캐시 디렉터리는 임시 폴더 → 첫 단계는 콜드 캐시, 다음 단계부터는 프로세스/디스크 캐시가 데워진 상태
+#   python bench/load.py --levels 1,2,4,8 --tour-latency-ms 120 --openai-latency-ms 600
+SURVEYS = [
+    {"scenery": ["바다"], "transport": ["기차"], "trip_days": ["1박 2일"], "activities": ["사진 스팟"]},
+    {"scenery": ["산"], "transport": ["자동차"], "trip_days": ["2박 3일"], "activities": ["온천,스파"]},
+    {"scenery": ["도시"], "transport": ["고속버스"], "trip_days": ["당일여행"], "activities": ["역사,문화"]},
+    {"scenery": ["바다", "산"], "transport": ["비행기", "자동차"], "trip_days": ["3박 이상"], "activities": ["테마파크"]},
+]
+
+def rss_mb() -> float:
+    # 현재 RSS(MB) — /proc이 없으면 ru_maxrss(프로세스 최대값)로 대신
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+class PeakSampler:
+    # 백그라운드에서 RSS를 주기적으로 읽어 최대값을 기록
+    def __init__(self, interval_sec: float = 0.05):
+        self.interval_sec = interval_sec
+        self.peak = rss_mb()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="rss-sampler")
+
+    def _run(self):
+        while not self._stop.wait(self.interval_sec):
+            self.peak = max(self.peak, rss_mb())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, rss_mb())
+
+def run_session(session_no: int, clicks: int, timeout: float, latencies: list, errors: list, lock: threading.Lock) -> None:
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(session_no)
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout).run()
+    for key, values in rng.choice(SURVEYS).items():
+        at.multiselect(key=key).set_value(values)
+    at.run()
+
+    for i in range(clicks):
+        button = at.button[0] if i == 0 else at.button[1]  # 결과 보기 → 다시 뽑기 …
+        started = time.perf_counter()
+        try:
+            button.click().run()
+            failed = list(at.exception) or (None if at.session_state.results else ["결과 없음"])
+        except Exception as e:
+            failed = [repr(e)]
+        elapsed = (time.perf_counter() - started) * 1000
+        with lock:
+            latencies.append(("recommend" if i == 0 else "reroll", elapsed))
+            if failed:
+                errors.append((session_no, i, str(failed[0])[:200]))
+
+def run_level(concurrency: int, clicks: int, timeout: float) -> dict:
+    latencies, errors, lock = [], [], threading.Lock()
+    threads = [
+        threading.Thread(target=run_session, args=(n, clicks, timeout, latencies, errors, lock), name=f"session-{n}")
+        for n in range(concurrency)
+    ]
+    with PeakSampler() as sampler:
+        started = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        wall = time.perf_counter() - started
+    return {"latencies": latencies, "errors": errors, "wall": wall, "peak_rss": sampler.peak}
+
+def percentile(values: list, q: float) -> float:
+    values = sorted(values)
+    if not values:
+        return float("nan")
+    k = min(len(values) - 1, max(0, round(q / 100 * (len(values) - 1))))
+    return values[k]
+
+def setup_cache_env(cache_dir: str) -> None:
+    # 앱 모듈(tourapi/enrich/thumbs/telemetry)은 import 시점에 환경 변수를 읽는다 → 앱 import 전에 설정
+    os.makedirs(cache_dir, exist_ok=True)
+    os.environ.setdefault("TOUR_CACHE_PATH", os.path.join(cache_dir, "tourapi.sqlite3"))
+    os.environ.setdefault("DETAIL_CACHE_PATH", os.path.join(cache_dir, "details.sqlite3"))
+    os.environ.setdefault("THUMB_CACHE_DIR", os.path.join(cache_dir, "thumbs"))
+    os.environ.setdefault("SPOT_SOURCE", "api")
+    os.environ.setdefault("TELEMETRY_LOG", os.path.join(cache_dir, "telemetry.jsonl"))
+
+def main(argv=None) -> int:
+    # 스텁은 앱 모듈을 import 하지 않는다 — 앱 모듈(telemetry, AppTest의 app.py)은 환경 변수를 다 정한 뒤에 import
+    parser = argparse.ArgumentParser(description="app.py 다중 세션 부하 테스트 (로컬 TourAPI/OpenAI 스텁 + Streamlit AppTest)")
+    parser.add_argument("--cache-dir", default=None, help="캐시 폴더 (기본: 임시 폴더 — 콜드 캐시로 시작)")
+    parser.add_argument("--levels", default="1,2,4,8", help="동시 세션 수(쉼표 구분)")
+    parser.add_argument("--clicks", type=int, default=3, help="세션당 클릭 수 (첫 번째는 결과 보기, 나머지는 다시 뽑기)")
+    parser.add_argument("--timeout", type=float, default=120, help="AppTest 한 번 실행 상한(초)")
+    parser.add_argument("--no-openai", action="store_true", help="OpenAI 키 없이(로컬 플랜/이유 fallback)")
+    parser.add_argument("--tour-url", default=None, help="이미 떠 있는 TourAPI 스텁/서버 주소 (없으면 내장 스텁)")
+    parser.add_argument("--openai-url", default=None, help="이미 떠 있는 OpenAI 호환 서버 주소 (없으면 내장 스텁)")
+    parser.add_argument("--rows-per-area", type=int, default=stub_tourapi.ROWS_PER_AREA)
+    parser.add_argument("--chunk-chars", type=int, default=4, help="OpenAI 스텁 스트리밍 조각당 글자 수")
+    # 스텁 옵션은 각 스텁 CLI와 같은 이름에 접두사만 붙인다
+    stub_tourapi.add_arguments(parser, "tour-")
+    stub_openai.add_arguments(parser, "openai-")
+    args = parser.parse_args(argv)
+    cache_dir = args.cache_dir or tempfile.mkdtemp(prefix="travel-bench-")
+    setup_cache_env(cache_dir)
+
+    tour = None
+    if args.tour_url is None:
+        tour = stub_tourapi.serve(0, args.tour_latency_ms, args.tour_jitter_ms, args.tour_error_rate, args.rows_per_area)
+    tour_url = args.tour_url or tour.base_url
+    os.environ["TOUR_BASE_URL"] = tour_url
+    os.environ["TOUR_API_KEY"] = os.environ.get("TOUR_API_KEY") or "bench"
+
+    llm = None
+    if args.no_openai:
+        os.environ.pop("OPENAI_API_KEY", None)
+    else:
+        if args.openai_url is None:
+            llm = stub_openai.serve(0, args.openai_latency_ms, args.openai_jitter_ms, args.openai_error_rate, args.openai_token_ms, args.chunk_chars)
+        os.environ["OPENAI_BASE_URL"] = args.openai_url or llm.base_url
+        os.environ["OPENAI_API_KEY"] = os.environ.get("OPENAI_API_KEY") or "sk-bench"
+
+    import telemetry
+
+    print(f"cache={cache_dir}  tour={tour_url}  openai={os.environ.get('OPENAI_BASE_URL') if not args.no_openai else '(off)'}")
+    print(f"{'sessions':>8}{'click':>11}{'n':>5}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'clicks/s':>10}{'peak MB':>10}{'errors':>8}")
+    for level in (int(x) for x in args.levels.split(",") if x.strip()):
+        result = run_level(level, args.clicks, args.timeout)
+        throughput = len(result["latencies"]) / result["wall"] if result["wall"] else 0.0
+        for kind in ("recommend", "reroll"):
+            ms = [v for k, v in result["latencies"] if k == kind]
+            if not ms:
+                continue
+            print(
+                f"{level:>8}{kind:>11}{len(ms):>5}{percentile(ms, 50):>10.0f}{percentile(ms, 95):>10.0f}{max(ms):>10.0f}"
+                f"{throughput:>10.2f}{result['peak_rss']:>10.0f}{len(result['errors']):>8}"
+            )
+        for session_no, click, message in result["errors"][:3]:
+            print(f"    session {session_no} click {click}: {message}")
+
+    # 단계별 시간(앱의 telemetry trace) — 전체 실행 합산
+    print()
+    print(f"{'stage':<24}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}")
+    for name, (n, p50, p95) in telemetry.stage_percentiles(telemetry.recent_traces()).items():
+        print(f"{name:<24}{n:>6}{p50:>10.1f}{p95:>10.1f}")
+    print(f"\ntelemetry log: {os.environ['TELEMETRY_LOG']}  (python telemetry.py <log>로 다시 집계)")
+    if tour is not None:
+        print(f"tour stub requests: {tour.requests}")
+    if llm is not None:
+        print(f"openai stub requests: {llm.requests}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+import os
+import sys
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import keywords
+from geo import TravelModel
+from ranking import CandidateTable, rank_pool, reachable_filter, scenery_strict_filter, total_rank_score
+from spots import spots_from_items
+from stub_tourapi import make_item
+
+# =========================================================
+# Microbenchmarks (랭킹 핫패스 — 네트워크 없음)
+# =========================================================
+# 스텁 TourAPI와 같은 합성 관광지로 큰 후보 풀을 만들고 단계별 시간을 잰다.
+#   python bench/micro.py --sizes 1000,10000,50000 --repeat 5
+AREAS = (1, 6, 32, 35, 36, 38, 39)
+SCENERY = ["바다", "산"]
+TRANSPORT = ["기차", "자동차"]
+ACTIVITIES = ["사진 스팟", "역사,문화"]
+TRIP_DAYS = ["1박 2일"]
+
+def make_pool(size: int) -> list:
+    # 지역별로 나눠 담은 Spot 목록 (spots_by_area)
+    per_area = -(-size // len(AREAS))
+    return [spots_from_items([make_item(area, n) for n in range(per_area)]) for area in AREAS]
+
+def measure(fn, repeat: int) -> list:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return times
+
+def report(name: str, size: int, times: list) -> None:
+    best, median = min(times), statistics.median(times)
+    print(f"{name:<40}{size:>8}{best:>10.2f}{median:>10.2f}{best * 1000 / size:>10.2f}")
+
+def cold_features(spots_by_area: list) -> None:
+    # 특징 캐시(LRU + Spot 슬롯)를 비워 첫 클릭 상황을 만든다
+    keywords._feature_cache.clear()
+    for spots in spots_by_area:
+        for s in spots:
+            s.features = None
+
+def run(size: int, repeat: int, origin: str) -> None:
+    spots_by_area = make_pool(size)
+    flat = [s for spots in spots_by_area for s in spots]
+    n = len(flat)
+    travel = TravelModel.build(origin, TRANSPORT, TRIP_DAYS)
+
+    def strict_cold():
+        cold_features(spots_by_area)
+        scenery_strict_filter(flat, SCENERY)
+
+    report("scenery_strict_filter (cold features)", n, measure(strict_cold, repeat))
+    report("scenery_strict_filter (warm)", n, measure(lambda: scenery_strict_filter(flat, SCENERY), repeat))
+    report("total_rank_score sort", n, measure(lambda: sorted(flat, key=lambda s: total_rank_score(s, SCENERY, ACTIVITIES), reverse=True), repeat))
+    # 이동 시간 감점은 도달 가능 필터를 통과한 후보에만 매긴다(앱과 같은 순서)
+    report(f"reachable_filter ({origin})", n, measure(lambda: reachable_filter(flat, travel), repeat))
+    reachable = reachable_filter(flat, travel)
+    report(f"total_rank_score sort (travel {origin})", len(reachable), measure(lambda: sorted(reachable, key=lambda s: total_rank_score(s, SCENERY, ACTIVITIES, travel), reverse=True), repeat))
+    report("CandidateTable.from_areas", n, measure(lambda: CandidateTable.from_areas(spots_by_area), repeat))
+    for engine, scorer in (("python", "keyword"), ("vector", "keyword"), ("vector", "ngram")):
+        for label, tm in (("", None), (" + travel", travel)):
+            report(
+                f"rank_pool {engine}/{scorer}{label}", n,
+                measure(lambda: rank_pool(spots_by_area, TRANSPORT, SCENERY, ACTIVITIES, top_k=30, engine=engine, travel=tm, scorer=scorer), repeat),
+            )
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="랭킹 핫패스 마이크로벤치마크 (scenery_strict_filter / total_rank_score / rank_pool)")
+    parser.add_argument("--sizes", default="1000,10000,50000", help="후보 풀 크기(쉼표 구분)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--origin", default="서울", help="이동 시간 감점에 쓸 출발지")
+    args = parser.parse_args(argv)
+
+    print(f"{'benchmark':<40}{'n':>8}{'best ms':>10}{'med ms':>10}{'us/spot':>10}")
+    for size in (int(s) for s in args.sizes.split(",") if s.strip()):
+        run(size, args.repeat, args.origin)
+        print()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+import re
+import sys
+import json
+import time
+import uuid
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# =========================================================
+# OpenAI-compatible stand-in (POST /v1/chat/completions, stream 포함)
+# =========================================================
+# - 앱이 보내는 세 종류의 요청을 프롬프트로 구분해 그럴듯한 응답을 만든다
+#     플랜(시스템 프롬프트에 "플래너") → {"areas": [...], "style_summary": ...}
+#     이유 배치(response_format=json_object) → {"reasons": {contentid: ...}}
+#     그 밖(이유 1곳 / 채팅) → 짧은 문장
+# - --latency-ms: 첫 응답까지 지연, --token-ms: 스트리밍 조각 사이 지연
+# - --error-rate: 429(retry-after) / 500 섞기 — 앱의 재시도·차단기 경로 확인용
+SCENERY_AREAS = {
+    "바다": [("부산", 6), ("강원", 32), ("경남", 36), ("전남", 38), ("제주", 39)],
+    "산": [("강원", 32), ("경북", 35), ("충북", 33), ("경기", 31), ("전북", 37)],
+    "도시": [("서울", 1), ("부산", 6), ("대구", 4), ("인천", 2), ("광주", 5)],
+}
+TITLE_RE = re.compile(r"이름: ([^/\n]+)")
+CONTENTID_RE = re.compile(r"contentid=(\S+) / 이름: ([^/\n]+)")
+SCENERY_RE = re.compile(r"풍경/환경\(1순위\): ([^\n]+)")
+
+def plan_reply(text: str) -> str:
+    m = SCENERY_RE.search(text)
+    areas = []
+    for name in (m.group(1).split(", ") if m else []):
+        areas.extend(a for a in SCENERY_AREAS.get(name.strip(), []) if a not in areas)
+    areas = areas[:5] or SCENERY_AREAS["도시"][:4]
+    return json.dumps({"areas": [{"name": n, "areaCode": c} for n, c in areas], "style_summary": "스텁 플랜"}, ensure_ascii=False)
+
+def reason_for(title: str) -> str:
+    return f"{title.strip()}은(는) 선택한 풍경을 가까이에서 즐길 수 있고, 고른 이동수단으로 찾아가기 편한 곳이에요."
+
+def reply_for(body: dict) -> str:
+    messages = body.get("messages") or []
+    system = " ".join(m.get("content", "") for m in messages if m.get("role") == "system")
+    text = " ".join(m.get("content", "") for m in messages)
+    if "플래너" in system:
+        return plan_reply(text)
+    if (body.get("response_format") or {}).get("type") == "json_object":
+        reasons = {cid: reason_for(title) for cid, title in CONTENTID_RE.findall(text)}
+        return json.dumps({"reasons": reasons}, ensure_ascii=False)
+    m = TITLE_RE.search(text)
+    if m:
+        return reason_for(m.group(1))
+    return "좋아요! 출발지와 예산을 조금 더 알려주면 더 잘 맞는 곳을 찾을 수 있어요."
+
+def completion(content: str, model: str) -> dict:
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:12]}", "object": "chat.completion", "created": int(time.time()), "model": model,
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+    }
+
+def chunk(cid: str, model: str, delta: dict, finish=None) -> bytes:
+    obj = {
+        "id": cid, "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+    }
+    return f"data: {json.dumps(obj, ensure_ascii=False)}\n\n".encode("utf-8")
+
+class OpenAIStubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _send_json(self, status: int, obj: dict, headers: dict = None) -> None:
+        body = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        cfg = self.server.config
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "not found", "type": "invalid_request_error"}})
+            return
+        self.server.count("stream" if body.get("stream") else "create")
+
+        time.sleep((cfg["latency_ms"] + random.uniform(0, cfg["jitter_ms"])) / 1000)
+        if random.random() < cfg["error_rate"]:
+            if random.random() < 0.5:
+                self._send_json(429, {"error": {"message": "rate limited", "type": "rate_limit_error"}}, {"retry-after-ms": "200"})
+            else:
+                self._send_json(500, {"error": {"message": "server error", "type": "server_error"}})
+            return
+
+        model = body.get("model", "gpt-4o-mini")
+        content = reply_for(body)
+        if not body.get("stream"):
+            self._send_json(200, completion(content, model))
+            return
+
+        # SSE — 글자 몇 개씩 조각으로
+        cid = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        try:
+            self.wfile.write(chunk(cid, model, {"role": "assistant", "content": ""}))
+            for i in range(0, len(content), cfg["chunk_chars"]):
+                time.sleep(cfg["token_ms"] / 1000)
+                self.wfile.write(chunk(cid, model, {"content": content[i:i + cfg["chunk_chars"]]}))
+                self.wfile.flush()
+            self.wfile.write(chunk(cid, model, {}, "stop"))
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+class OpenAIStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, config: dict):
+        super().__init__(address, OpenAIStubHandler)
+        self.config = config
+        self.requests = {}
+        self._lock = threading.Lock()
+
+    def count(self, kind: str) -> None:
+        with self._lock:
+            self.requests[kind] = self.requests.get(kind, 0) + 1
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+def serve(port: int = 0, latency_ms: float = 400, jitter_ms: float = 200, error_rate: float = 0.0, token_ms: float = 15, chunk_chars: int = 4) -> OpenAIStubServer:
+    # server.base_url을 OPENAI_BASE_URL로
+    config = {"latency_ms": latency_ms, "jitter_ms": jitter_ms, "error_rate": error_rate, "token_ms": token_ms, "chunk_chars": chunk_chars}
+    server = OpenAIStubServer(("127.0.0.1", port), config)
+    threading.Thread(target=server.serve_forever, daemon=True, name="openai-stub").start()
+    return server
+
+def add_arguments(parser: argparse.ArgumentParser, prefix: str = "") -> None:
+    parser.add_argument(f"--{prefix}latency-ms", type=float, default=400, help="첫 응답까지 지연(ms)")
+    parser.add_argument(f"--{prefix}jitter-ms", type=float, default=200, help="추가 지연 0~N ms (균등 분포)")
+    parser.add_argument(f"--{prefix}error-rate", type=float, default=0.0, help="오류 응답 비율 (429 / 500 반반)")
+    parser.add_argument(f"--{prefix}token-ms", type=float, default=15, help="스트리밍 조각 사이 지연(ms)")
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="OpenAI 호환(chat.completions) 로컬 스텁 서버")
+    parser.add_argument("--port", type=int, default=8802)
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server = serve(args.port, args.latency_ms, args.jitter_ms, args.error_rate, args.token_ms)
+    print(f"OPENAI_BASE_URL={server.base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
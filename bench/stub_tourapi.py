@@ -0,0 +1,203 @@
+import io
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from PIL import Image
+
+# =========================================================
+# Local TourAPI stand-in (KorService2/areaBasedList2, detailCommon2, 이미지)
+# =========================================================
+# - 지역/행 번호로 결정되는(매번 같은) 관광지 목록 — 실제 응답과 같은 필드 구성(~25개)
+# - --latency-ms/--jitter-ms로 응답 지연, --error-rate로 HTTP 500 / 트래픽 초과(resultCode 22) 섞기
+# - firstimage는 이 서버의 /img/... → 썸네일 파이프라인까지 로컬에서 돈다
+# - 앱 모듈은 import 하지 않는다 → 앱이 TOUR_BASE_URL을 읽기 전에 스텁을 띄우고 주소를 정할 수 있음
+ROWS_PER_AREA = 1200
+DEFAULT_ROWS = 180
+CONTENT_TYPE_TOUR = 12
+
+# areaCode → (이름, 중심 경도, 중심 위도, 반경 km) — 실제 TourAPI 지역 코드 / geo.AREA_CENTERS와 같은 값
+AREAS = {
+    1: ("서울", 126.978, 37.566, 15), 2: ("인천", 126.705, 37.456, 25), 3: ("대전", 127.385, 36.351, 12),
+    4: ("대구", 128.601, 35.871, 20), 5: ("광주", 126.852, 35.160, 12), 6: ("부산", 129.075, 35.180, 20),
+    7: ("울산", 129.311, 35.539, 25), 8: ("세종", 127.289, 36.480, 15), 31: ("경기", 127.180, 37.550, 70),
+    32: ("강원", 128.300, 37.750, 110), 33: ("충북", 127.700, 36.800, 70), 34: ("충남", 126.800, 36.500, 70),
+    35: ("경북", 128.750, 36.350, 110), 36: ("경남", 128.250, 35.300, 80), 37: ("전북", 127.150, 35.720, 70),
+    38: ("전남", 126.900, 34.850, 90), 39: ("제주", 126.550, 33.380, 40),
+}
+
+NAME_PARTS = ["해운", "광안", "송정", "청사", "월정", "한라", "설악", "지리", "소백", "백운", "남산", "용두", "태종", "동백", "은하", "푸른", "하늘", "솔밭"]
+KINDS = [
+    ("해수욕장", "A01011200"), ("해변", "A01011100"), ("등대", "A01011600"), ("항", "A01011400"), ("산", "A01010400"),
+    ("계곡", "A01010900"), ("국립공원", "A01010100"), ("휴양림", "A01010600"), ("전망대", "A02050200"), ("타워", "A02050200"),
+    ("시장", "A04010200"), ("박물관", "A02060100"), ("미술관", "A02060500"), ("사", "A02010800"), ("산성", "A02010200"),
+    ("궁", "A02010100"), ("온천", "A02020300"), ("랜드", "A02020600"), ("둘레길", "A01010500"), ("문화거리", "A02030600"),
+    ("공원", "A02020700"), ("마을", "A02030300"),
+]
+OVERVIEWS = {
+    "A01": "푸른 바다와 기암절벽이 어우러진 곳으로 산책로와 해안 풍경이 아름답다.",
+    "A02": "오랜 역사와 문화를 간직한 곳으로 전시와 체험 프로그램이 운영된다.",
+    "A04": "지역 먹거리와 특산물을 만날 수 있는 곳으로 주말이면 사람들로 붐빈다.",
+}
+
+def make_item(area: int, n: int, base_url: str = "http://127.0.0.1") -> dict:
+    rng = random.Random(area * 1_000_003 + n)
+    kind, cat3 = KINDS[rng.randrange(len(KINDS))]
+    name, lon, lat, radius = AREAS[area]
+    spread = radius / 111.0
+    cid = f"{area:02d}{n:06d}"
+    has_image = rng.random() < 0.8
+    return {
+        "addr1": f"{name} {rng.choice(['중구', '동구', '서구', '남구', '북구'])} {rng.randint(1, 999)}",
+        "addr2": "", "areacode": str(area), "booktour": "", "cat1": cat3[:3], "cat2": cat3[:5], "cat3": cat3,
+        "contentid": cid, "contenttypeid": str(CONTENT_TYPE_TOUR),
+        "createdtime": "20200101000000", "modifiedtime": "20240101000000",
+        "firstimage": f"{base_url}/img/{cid}.jpg" if has_image else "",
+        "firstimage2": f"{base_url}/img/{cid}_s.jpg" if has_image else "",
+        "cpyrhtDivCd": "Type3",
+        "mapx": f"{lon + rng.uniform(-spread, spread):.7f}", "mapy": f"{lat + rng.uniform(-spread, spread) * 0.8:.7f}",
+        "mlevel": "6", "sigungucode": str(rng.randint(1, 20)), "tel": "", "zipcode": f"{rng.randint(10000, 63999)}",
+        "title": f"{rng.choice(NAME_PARTS)}{kind} {n}",
+        "lDongRegnCd": "", "lDongSignguCd": "", "lclsSystm1": "", "lclsSystm2": "", "lclsSystm3": "",
+    }
+
+def envelope(items: list, total: int, rows: int, page: int) -> dict:
+    return {"response": {
+        "header": {"resultCode": "0000", "resultMsg": "OK"},
+        "body": {"items": {"item": items} if items else "", "numOfRows": rows, "pageNo": page, "totalCount": total},
+    }}
+
+def area_payload(area: int, page: int, rows: int, base_url: str, total: int = ROWS_PER_AREA) -> dict:
+    start = (page - 1) * rows
+    items = [make_item(area, n, base_url) for n in range(start, min(start + rows, total))]
+    return envelope(items, total, rows, page)
+
+def detail_payload(contentid: str) -> dict:
+    cat3 = ""
+    try:
+        cat3 = make_item(int(contentid[:2]), int(contentid[2:]))["cat3"]
+    except (ValueError, KeyError):
+        pass
+    item = {"contentid": contentid, "cat3": cat3, "overview": f"<p>{OVERVIEWS.get(cat3[:3], OVERVIEWS['A02'])}</p>"}
+    return envelope([item], 1, 1, 1)
+
+LIMITED = {"response": {"header": {"resultCode": "22", "resultMsg": "LIMITED_NUMBER_OF_SERVICE_REQUESTS_EXCEEDS_ERROR"}}}
+
+_image_lock = threading.Lock()
+_image_bytes = None
+
+def image_bytes() -> bytes:
+    # 원본 사진 크기(1024x683) JPEG 한 장을 만들어 모든 URL에 돌려준다
+    global _image_bytes
+    with _image_lock:
+        if _image_bytes is None:
+            img = Image.linear_gradient("L").resize((1024, 683)).convert("RGB")
+            out = io.BytesIO()
+            img.save(out, "JPEG", quality=90)
+            _image_bytes = out.getvalue()
+    return _image_bytes
+
+class TourStubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        cfg = self.server.config
+        url = urlparse(self.path)
+        q = {k: v[0] for k, v in parse_qs(url.query).items()}
+        self.server.count(url.path)
+
+        if url.path.startswith("/img/"):
+            self._send(200, image_bytes(), "image/jpeg")
+            return
+
+        delay = cfg["latency_ms"] + random.uniform(0, cfg["jitter_ms"])
+        time.sleep(delay / 1000)
+        if random.random() < cfg["error_rate"]:
+            if random.random() < 0.5:
+                self._send(500, b"Internal Server Error", "text/plain")
+            else:
+                self._send(200, json.dumps(LIMITED).encode("utf-8"), "application/json")
+            return
+
+        host, port = self.server.server_address[:2]
+        base_url = f"http://{host}:{port}"
+        if url.path.endswith("/areaBasedList2"):
+            try:
+                area = int(q.get("areaCode", 0))
+                page = max(1, int(q.get("pageNo", 1)))
+                rows = max(1, int(q.get("numOfRows", DEFAULT_ROWS)))
+            except ValueError:
+                self._send(400, b"bad request", "text/plain")
+                return
+            data = area_payload(area, page, rows, base_url, cfg["rows_per_area"]) if area in AREAS else envelope([], 0, rows, page)
+        elif url.path.endswith("/detailCommon2"):
+            data = detail_payload(q.get("contentId", ""))
+        else:
+            self._send(404, b"not found", "text/plain")
+            return
+        self._send(200, json.dumps(data, ensure_ascii=False).encode("utf-8"), "application/json;charset=UTF-8")
+
+class TourStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, config: dict):
+        super().__init__(address, TourStubHandler)
+        self.config = config
+        self.requests = {}
+        self._lock = threading.Lock()
+
+    def count(self, path: str) -> None:
+        key = "img" if path.startswith("/img/") else path.rsplit("/", 1)[-1]
+        with self._lock:
+            self.requests[key] = self.requests.get(key, 0) + 1
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/B551011/KorService2"
+
+def serve(port: int = 0, latency_ms: float = 80, jitter_ms: float = 40, error_rate: float = 0.0, rows_per_area: int = ROWS_PER_AREA) -> TourStubServer:
+    # 백그라운드 스레드에서 띄우고 서버를 돌려준다(port=0이면 빈 포트) — server.base_url을 TOUR_BASE_URL로
+    config = {"latency_ms": latency_ms, "jitter_ms": jitter_ms, "error_rate": error_rate, "rows_per_area": rows_per_area}
+    server = TourStubServer(("127.0.0.1", port), config)
+    threading.Thread(target=server.serve_forever, daemon=True, name="tour-stub").start()
+    return server
+
+def add_arguments(parser: argparse.ArgumentParser, prefix: str = "") -> None:
+    parser.add_argument(f"--{prefix}latency-ms", type=float, default=80, help="응답 지연(ms)")
+    parser.add_argument(f"--{prefix}jitter-ms", type=float, default=40, help="추가 지연 0~N ms (균등 분포)")
+    parser.add_argument(f"--{prefix}error-rate", type=float, default=0.0, help="오류 응답 비율 (HTTP 500 / resultCode 22 반반)")
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="TourAPI(KorService2) 로컬 스텁 서버")
+    parser.add_argument("--port", type=int, default=8801)
+    parser.add_argument("--rows-per-area", type=int, default=ROWS_PER_AREA, help="지역별 totalCount")
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server = serve(args.port, args.latency_ms, args.jitter_ms, args.error_rate, args.rows_per_area)
+    print(f"TOUR_BASE_URL={server.base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+import os
+import re
+import sys
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from inflight import PendingFutures
+from keywords import refresh_features
+from response_cache import ResponseCache
+from tourapi import REQUEST_TIMEOUT_SEC, is_cacheable, safe_items, tourapi_get
+
+# =========================================================
+# Detail enrichment (detailCommon2 개요/분류 → 키워드 특징 보강)
+# =========================================================
+# - 후보 중 상위 일부(shortlist)만 상세 정보를 붙인다
+# - contentid별 결과는 디스크에 오래 보관(개요는 거의 바뀌지 않음)
+# - 클릭 1번이 기다리는 시간은 ENRICH_BUDGET_SEC까지 — 늦은 요청은 백그라운드에서 끝나 다음 클릭에 쓰인다
+ENRICH_ENABLED = os.getenv("ENRICH_DETAILS", "1") != "0"   # TourAPI 일일 호출량이 빠듯하면 0
+ENRICH_MAX_SPOTS = 60
+ENRICH_PER_AREA = 15
+ENRICH_WORKERS = 6
+ENRICH_BUDGET_SEC = 2.0
+ENRICH_MAX_PENDING = 240     # 백그라운드 대기 상한 — TourAPI가 느릴 때 작업이 끝없이 쌓이지 않게
+OVERVIEW_MAX_CHARS = 200     # 개요는 앞부분만(뒤로 갈수록 주변 안내 등 잡음이 많다)
+
+DETAIL_CACHE_PATH = os.getenv("DETAIL_CACHE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "details.sqlite3"))
+DETAIL_CACHE_TTL_SEC = 30 * 24 * 3600
+DETAIL_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+TAG_RE = re.compile(r"<[^>]+>|&[a-z]+;")
+
+_cache = None
+_cache_lock = threading.Lock()
+_pending = PendingFutures(ThreadPoolExecutor(max_workers=ENRICH_WORKERS, thread_name_prefix="enrich"), ENRICH_MAX_PENDING)  # contentid -> Future
+
+def get_detail_cache():
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                try:
+                    _cache = ResponseCache(DETAIL_CACHE_PATH, max_bytes=DETAIL_CACHE_MAX_BYTES, max_age_sec=DETAIL_CACHE_TTL_SEC)
+                except Exception:
+                    _cache = False
+    return _cache or None
+
+def clean_overview(text: str) -> str:
+    text = " ".join(TAG_RE.sub(" ", text or "").split())
+    return text[:OVERVIEW_MAX_CHARS]
+
+def cached_detail(contentid: str):
+    cache = get_detail_cache()
+    if cache is None:
+        return None
+    try:
+        hit = cache.get(contentid)
+    except Exception:
+        return None
+    return hit[0] if hit is not None else None
+
+def fetch_detail(contentid: str, service_key: str, timeout: float = REQUEST_TIMEOUT_SEC) -> dict:
+    # 응답 전체가 아니라 필요한 두 값만 contentid 키로 보관 (tourapi 응답 캐시는 거치지 않음)
+    data = tourapi_get("detailCommon2", {"contentId": contentid}, service_key, timeout=timeout, use_cache=False)
+    if not is_cacheable(data):
+        raise ValueError(f"detailCommon2 failed for {contentid}")
+    items = safe_items(data)
+    item = items[0] if items else {}
+    detail = {"overview": clean_overview(item.get("overview")), "cat3": item.get("cat3") or ""}
+    cache = get_detail_cache()
+    if cache is not None:
+        try:
+            cache.set(contentid, detail)
+        except Exception:
+            pass
+    return detail
+
+def apply_detail(spot, detail: dict) -> None:
+    spot.overview = sys.intern(detail.get("overview") or "")
+    if not spot.cat3 and detail.get("cat3"):
+        spot.cat3 = sys.intern(detail["cat3"])
+    refresh_features(spot)
+
+def _submit(contentid: str, service_key: str):
+    # 같은 contentid는 세션이 달라도 한 번만 요청 (대기 상한을 넘으면 None)
+    return _pending.submit(contentid, fetch_detail, contentid, service_key)
+
+def enrich_spots(spots: list, service_key: str, budget_sec: float = ENRICH_BUDGET_SEC, limit: int = ENRICH_MAX_SPOTS) -> int:
+    # spots(Spot)에 개요/분류를 붙이고 특징을 다시 계산 — 붙인 개수를 돌려준다
+    if not ENRICH_ENABLED:
+        return 0
+    started = time.monotonic()
+    targets = [s for s in spots if s.get("contentid") and not s.overview][:limit]
+
+    enriched, futures = 0, {}
+    for spot in targets:
+        detail = cached_detail(spot.contentid)
+        if detail is not None:
+            apply_detail(spot, detail)
+            enriched += 1
+        elif service_key:
+            fut = _submit(spot.contentid, service_key)
+            if fut is not None:
+                futures.setdefault(fut, []).append(spot)
+
+    if futures:
+        done, _ = wait(futures, timeout=max(0.0, budget_sec - (time.monotonic() - started)))
+        for fut in done:
+            if fut.exception() is None:
+                for spot in futures[fut]:
+                    apply_detail(spot, fut.result())
+                    enriched += 1
+    return enriched
@@ -0,0 +1,152 @@
+import math
+
+import numpy as np
+
+# =========================================================
+# 출발지 / 이동 시간 모델 (mapx=경도, mapy=위도)
+# =========================================================
+EARTH_RADIUS_KM = 6371.0
+
+# 주요 출발지 좌표 (경도, 위도)
+ORIGINS = {
+    "서울": (126.978, 37.566), "인천": (126.705, 37.456), "수원": (127.029, 37.263), "성남": (127.127, 37.420),
+    "고양": (126.832, 37.658), "춘천": (127.730, 37.881), "강릉": (128.876, 37.752), "원주": (127.920, 37.342),
+    "청주": (127.489, 36.642), "천안": (127.114, 36.815), "대전": (127.385, 36.351), "세종": (127.289, 36.480),
+    "전주": (127.148, 35.824), "광주": (126.852, 35.160), "목포": (126.392, 34.812), "여수": (127.662, 34.760),
+    "대구": (128.601, 35.871), "포항": (129.343, 36.019), "울산": (129.311, 35.539), "창원": (128.681, 35.228),
+    "부산": (129.075, 35.180), "제주": (126.531, 33.500),
+}
+# 흔한 다른 표기 → ORIGINS 키
+ORIGIN_ALIASES = {
+    "서울역": "서울", "강남": "서울", "홍대": "서울", "잠실": "서울", "용산": "서울",
+    "판교": "성남", "분당": "성남", "일산": "고양", "동탄": "수원", "광명": "서울",
+    "동대구": "대구", "해운대": "부산", "서귀포": "제주", "오송": "청주",
+}
+
+# 지역(areaCode)별 대략적인 중심 좌표와 반경(km) — 지역 단위 사전 판정용
+AREA_CENTERS = {
+    1: (126.978, 37.566, 15), 2: (126.705, 37.456, 25), 3: (127.385, 36.351, 12), 4: (128.601, 35.871, 20),
+    5: (126.852, 35.160, 12), 6: (129.075, 35.180, 20), 7: (129.311, 35.539, 25), 8: (127.289, 36.480, 15),
+    31: (127.180, 37.550, 70), 32: (128.300, 37.750, 110), 33: (127.700, 36.800, 70), 34: (126.800, 36.500, 70),
+    35: (128.750, 36.350, 110), 36: (128.250, 35.300, 80), 37: (127.150, 35.720, 70), 38: (126.900, 34.850, 90),
+    39: (126.550, 33.380, 40),
+}
+
+# 이동수단별 (고정 시간h: 터미널/역/공항 대기 등, 평균 속도km/h, 직선→실제 경로 계수)
+TRANSPORT_COST = {
+    "자동차": (0.3, 75.0, 1.3),
+    "고속버스": (0.7, 65.0, 1.3),
+    "기차": (0.8, 110.0, 1.25),
+    "비행기": (2.0, 450.0, 1.0),
+}
+# 바다를 건너는 이동(제주 ↔ 육지)은 비행기만 가능
+SEA_ONLY_BY = "비행기"
+JEJU_MAX_LAT = 33.9
+
+# 여행 기간별 편도 이동 시간 상한(h) — None이면 제한 없음
+TRIP_MAX_HOURS = {"당일여행": 2.5, "1박 2일": 4.5, "2박 3일": 6.5, "3박 이상": None}
+
+def resolve_origin(text):
+    # 대화에서 뽑은 출발지 문자열 → ORIGINS 키 (모르면 None)
+    if not text:
+        return None
+    text = str(text)
+    for alias, name in ORIGIN_ALIASES.items():
+        if alias in text:
+            return name
+    for name in ORIGINS:
+        if name in text:
+            return name
+    return None
+
+def max_trip_hours(trip_days_list: list):
+    # 여러 기간을 고르면 가장 긴 쪽 기준
+    limits = [TRIP_MAX_HOURS[d] for d in trip_days_list if d in TRIP_MAX_HOURS]
+    if not limits or None in limits:
+        return None
+    return max(limits)
+
+def haversine_km(lon1, lat1, lon2, lat2):
+    # 배열/스칼라 모두 가능 (NumPy)
+    lon1, lat1, lon2, lat2 = map(np.radians, (lon1, lat1, lon2, lat2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+def haversine_km_one(lon1: float, lat1: float, lon2: float, lat2: float) -> float:
+    lon1, lat1, lon2, lat2 = map(math.radians, (lon1, lat1, lon2, lat2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+def leg_hours(km, transport: str):
+    fixed, speed, detour = TRANSPORT_COST[transport]
+    return fixed + km * detour / speed
+
+def _build_travel_table() -> dict:
+    # 출발지 × 지역 × 이동수단 편도 시간(h) — 지역 경계까지의 거리 기준
+    table = {}
+    for origin, (olon, olat) in ORIGINS.items():
+        for code, (alon, alat, radius) in AREA_CENTERS.items():
+            km = max(0.0, haversine_km_one(olon, olat, alon, alat) - radius)
+            sea = (olat < JEJU_MAX_LAT) != (alat < JEJU_MAX_LAT)
+            table[(origin, code)] = {
+                t: (math.inf if sea and t != SEA_ONLY_BY else 0.0 if km == 0 else leg_hours(km, t))
+                for t in TRANSPORT_COST
+            }
+    return table
+
+# import 시 한 번만 계산
+TRAVEL_TABLE = _build_travel_table()
+
+class TravelModel:
+    # 출발지 + 고른 이동수단 + 여행 기간 → 장소별 편도 시간(h), 도달 가능 여부
+    def __init__(self, origin: str, transport_list: list, trip_days_list: list):
+        self.origin = origin
+        self.lon, self.lat = ORIGINS[origin]
+        self.transports = [t for t in TRANSPORT_COST if t in transport_list] or list(TRANSPORT_COST)
+        self.max_hours = max_trip_hours(trip_days_list)
+        self.limit = self.max_hours if self.max_hours is not None else math.inf
+
+    @classmethod
+    def build(cls, origin_text, transport_list: list, trip_days_list: list):
+        origin = resolve_origin(origin_text)
+        return cls(origin, transport_list, trip_days_list) if origin else None
+
+    def area_hours(self, area_code) -> float:
+        row = TRAVEL_TABLE.get((self.origin, int(area_code)))
+        if row is None:
+            return math.nan
+        return min(row[t] for t in self.transports)
+
+    def reachable(self, hours) -> bool:
+        # 기간 상한 안 + 바다 건너 못 가는 곳(inf) 제외, 좌표 없음(nan)은 통과
+        return not (hours > self.limit or hours == math.inf)
+
+    def reachable_mask(self, hours):
+        return ~((hours > self.limit) | np.isinf(hours))
+
+    def area_reachable(self, area_code) -> bool:
+        return self.reachable(self.area_hours(area_code))
+
+    def hours(self, lon, lat):
+        # (n,) 배열 → (n,) 편도 시간, 좌표가 없으면 nan / 갈 수 없으면 inf
+        lon = np.asarray(lon, dtype=np.float64)
+        lat = np.asarray(lat, dtype=np.float64)
+        km = haversine_km(self.lon, self.lat, lon, lat)
+        sea = (lat < JEJU_MAX_LAT) != (self.lat < JEJU_MAX_LAT)
+        best = np.full(km.shape, np.inf)
+        for t in self.transports:
+            h = leg_hours(km, t)
+            if t != SEA_ONLY_BY:
+                h = np.where(sea, np.inf, h)
+            best = np.minimum(best, h)
+        return np.where(np.isnan(km), np.nan, best)
+
+    def hours_one(self, lon: float, lat: float) -> float:
+        if math.isnan(lon) or math.isnan(lat):
+            return math.nan
+        km = haversine_km_one(self.lon, self.lat, lon, lat)
+        sea = (lat < JEJU_MAX_LAT) != (self.lat < JEJU_MAX_LAT)
+        return min(
+            (leg_hours(km, t) for t in self.transports if t == SEA_ONLY_BY or not sea),
+            default=math.inf,
+        )
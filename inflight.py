@@ -0,0 +1,143 @@
+import threading
+from collections import OrderedDict
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# =========================================================
+# Single-flight: 같은 키의 동시 요청은 한 번만 실행하고 결과를 나눠 준다
+# =========================================================
+class _Call:
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.coalesced = 0  # 다른 요청에 합쳐진 횟수(관찰용)
+
+    def do(self, key, fn):
+        # (결과, 다른 요청의 결과를 받은 것인지) 를 돌려준다
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value, True
+
+        try:
+            call.value = fn()
+            return call.value, False
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+# =========================================================
+# 바이트 수 기준 in-memory LRU
+# =========================================================
+class ByteLRU:
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._lock = threading.Lock()
+        self._items = OrderedDict()  # key -> (value, size)
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            self._items.move_to_end(key)
+            return item[0]
+
+    def set(self, key, value, size: int) -> None:
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old[1]
+            self._items[key] = (value, size)
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes:
+                _, (_, evicted) = self._items.popitem(last=False)
+                self.total_bytes -= evicted
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+# =========================================================
+# Pending futures: 키별 백그라운드 작업(Future) — 같은 키는 끝날 때까지 한 번만 submit
+# =========================================================
+class PendingFutures:
+    def __init__(self, executor, max_pending: int = None):
+        self.executor = executor
+        self.max_pending = max_pending  # 대기 상한 — 넘으면 submit이 None
+        # add_done_callback은 이미 끝난 Future면 콜백을 바로(같은 스레드에서) 부른다 → 재진입 가능한 락
+        self._lock = threading.RLock()
+        self._futures = {}
+
+    def submit(self, key, fn, *args):
+        # 진행 중인 같은 키가 있으면 그 Future를 돌려준다
+        with self._lock:
+            fut = self._futures.get(key)
+            if fut is None:
+                if self.max_pending is not None and len(self._futures) >= self.max_pending:
+                    return None
+                fut = self.executor.submit(fn, *args)
+                self._futures[key] = fut
+                fut.add_done_callback(lambda f, k=key: self._forget(k, f))
+            return fut
+
+    def get(self, key):
+        with self._lock:
+            return self._futures.get(key)
+
+    def _forget(self, key, fut) -> None:
+        with self._lock:
+            if self._futures.get(key) is fut:
+                del self._futures[key]
+
+    def __len__(self) -> int:
+        return len(self._futures)
+
+# =========================================================
+# HTTP session (keep-alive, 프로세스 단위로 재사용)
+# =========================================================
+# app.py는 Streamlit rerun마다 다시 실행되지만 모듈은 한 번만 import 되므로
+# 모듈 전역의 SharedSession은 rerun·사용자 간에 커넥션 풀을 공유한다.
+class SharedSession:
+    def __init__(self, pool_connections: int, pool_maxsize: int):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self._lock = threading.Lock()
+        self._session = None
+
+    def get(self) -> requests.Session:
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    s = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize)
+                    s.mount("https://", adapter)
+                    s.mount("http://", adapter)
+                    self._session = s
+        return self._session
@@ -0,0 +1,129 @@
+import os
+import sys
+import time
+import argparse
+
+from tourapi import AREA_NAMES, CONTENT_TYPE_TOUR, is_cacheable, safe_items, tourapi_get
+from spot_index import INDEX_PATH, SpotIndex, write_index
+
+# =========================================================
+# Offline ingest: TourAPI areaBasedList2 → 로컬 관광지 인덱스
+# =========================================================
+# 사용 예)
+#   TOUR_API_KEY=... python ingest.py
+#   python ingest.py --areas 6,32 --max-per-area 500 --out data/spot_index
+PAGE_SIZE = 1000
+MAX_ATTEMPTS = 3
+RETRY_BASE_SEC = 1.5
+
+def fetch_page(area_code: int, page_no: int, service_key: str, page_size: int) -> dict:
+    # HTTP 200이어도 resultCode가 0000이 아니면(트래픽 초과/키 오류) 실패 — 빈 지역으로 저장하지 않는다
+    last_err = None
+    for attempt in range(MAX_ATTEMPTS):
+        try:
+            data = tourapi_get(
+                "areaBasedList2",
+                {
+                    "areaCode": area_code,
+                    "contentTypeId": CONTENT_TYPE_TOUR,
+                    "numOfRows": page_size,
+                    "pageNo": page_no,
+                    "arrange": "P",
+                },
+                service_key,
+                use_cache=False,
+            )
+            if is_cacheable(data):
+                return data
+            try:
+                header = data["response"]["header"]
+            except Exception:
+                header = {}
+            raise ValueError(f"TourAPI resultCode {header.get('resultCode')}: {header.get('resultMsg')}")
+        except Exception as e:
+            last_err = e
+            time.sleep(RETRY_BASE_SEC * (2 ** attempt))
+    raise last_err
+
+def fetch_all_spots(area_code: int, service_key: str, page_size: int = PAGE_SIZE, max_rows: int = None) -> list:
+    rows, seen, page_no, total = [], set(), 1, 0
+    while True:
+        data = fetch_page(area_code, page_no, service_key, page_size)
+        items = safe_items(data)
+        for item in items:
+            cid = item.get("contentid")
+            if cid and cid not in seen:
+                seen.add(cid)
+                rows.append(item)
+        try:
+            total = int(data["response"]["body"]["totalCount"])
+        except Exception:
+            total = 0
+        if not items or len(rows) >= total or page_no * page_size >= total:
+            break
+        if max_rows and len(rows) >= max_rows:
+            break
+        page_no += 1
+    if not rows and total > 0:
+        raise ValueError(f"totalCount {total} but no items")
+    return rows[:max_rows] if max_rows else rows
+
+def parse_areas(raw: str) -> list:
+    if not raw:
+        return list(AREA_NAMES)
+    codes = [int(c) for c in raw.split(",") if c.strip()]
+    unknown = [c for c in codes if c not in AREA_NAMES]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown areaCode: {unknown}")
+    return codes
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="TourAPI 관광지 목록을 받아 로컬 인덱스(메모리 매핑 스냅샷)로 저장합니다.")
+    parser.add_argument("--out", default=INDEX_PATH, help=f"인덱스 디렉터리 (기본: {INDEX_PATH})")
+    parser.add_argument("--areas", type=parse_areas, default=list(AREA_NAMES), help="쉼표로 구분한 areaCode (기본: 전체 17개 지역)")
+    parser.add_argument("--page-size", type=int, default=PAGE_SIZE, help="페이지당 행 수 (numOfRows)")
+    parser.add_argument("--max-per-area", type=int, default=None, help="지역별 최대 관광지 수 (인기순 상위)")
+    parser.add_argument("--service-key", default=os.getenv("TOUR_API_KEY", ""), help="TourAPI ServiceKey (기본: TOUR_API_KEY 환경 변수)")
+    args = parser.parse_args(argv)
+
+    if not args.service_key:
+        parser.error("TourAPI ServiceKey가 필요해요 (--service-key 또는 TOUR_API_KEY).")
+
+    # 실패한 지역은 기존 스냅샷 내용을 그대로 유지
+    try:
+        previous = SpotIndex(args.out)
+    except Exception:
+        previous = None
+
+    spots_by_area, failed = {}, []
+    for code in args.areas:
+        started = time.monotonic()
+        try:
+            spots = fetch_all_spots(code, args.service_key, args.page_size, args.max_per_area)
+        except Exception as e:
+            failed.append(code)
+            if previous is not None and previous.has_area(code):
+                spots_by_area[code] = previous.spots_for_area(code)
+                print(f"[{code:>2}] {AREA_NAMES[code]}: 실패({e}) → 이전 스냅샷 {len(spots_by_area[code])}곳 유지", file=sys.stderr)
+            else:
+                print(f"[{code:>2}] {AREA_NAMES[code]}: 실패({e})", file=sys.stderr)
+            continue
+        spots_by_area[code] = spots
+        print(f"[{code:>2}] {AREA_NAMES[code]}: {len(spots)}곳 ({time.monotonic() - started:.1f}s)", file=sys.stderr)
+
+    # 이번에 대상이 아닌 지역도 기존 스냅샷에서 이어받는다
+    if previous is not None:
+        for code in previous.areas:
+            if code not in spots_by_area:
+                spots_by_area[code] = previous.spots_for_area(code)
+
+    if not spots_by_area:
+        print("저장할 관광지가 없어요.", file=sys.stderr)
+        return 1
+
+    meta = write_index(args.out, spots_by_area)
+    print(f"{meta['count']}곳, {len(meta['areas'])}개 지역 → {args.out}", file=sys.stderr)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+import re
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+# =========================================================
+# Keyword lists (풍경/섬/활동)
+# =========================================================
+ISLAND_KEYWORDS = [
+    "울릉", "독도", "백령", "연평", "가파", "마라도", "추자", "흑산", "홍도", "비양", "청산도", "거문도",
+    "울릉군", "옹진군"
+]
+
+SEA_HINTS = ["해변", "바다", "해수욕장", "항", "포구", "등대", "해안", "갯벌", "선착장", "해안도로", "바닷길"]
+MOUNTAIN_HINTS = ["산", "등산", "트레킹", "케이블카", "계곡", "정상", "국립공원", "숲", "오름", "둘레길"]
+CITY_HINTS = ["도심", "시내", "거리", "광장", "전망대", "타워", "야경", "시장", "쇼핑", "문화", "전시", "뮤지엄", "박물관"]
+
+PHOTO_HINTS = ["전망", "포토", "타워", "전망대"]
+HISTORY_HINTS = ["성", "궁", "박물관", "유적", "문화", "사찰"]
+SPA_HINTS = ["온천", "스파", "탕"]
+THEME_PARK_HINTS = ["테마파크", "랜드", "월드"]
+
+# 특징 벡터의 칸 순서
+CATEGORIES = (
+    SEA_HINTS, MOUNTAIN_HINTS, CITY_HINTS, ISLAND_KEYWORDS,
+    PHOTO_HINTS, HISTORY_HINTS, SPA_HINTS, THEME_PARK_HINTS,
+)
+IDX_SEA, IDX_MOUNTAIN, IDX_CITY, IDX_ISLAND, IDX_PHOTO, IDX_HISTORY, IDX_SPA, IDX_THEME_PARK = range(len(CATEGORIES))
+
+# TourAPI 분류 코드(cat3) → 힌트 단어 — 제목/주소에 단서가 없는 장소도 분류로 점수를 받게
+CAT3_HINTS = {
+    "A01010100": "국립공원 산", "A01010400": "산 등산", "A01010500": "숲", "A01010600": "숲",
+    "A01010700": "숲", "A01010800": "계곡", "A01010900": "계곡",
+    "A01011100": "해안 바다", "A01011200": "해수욕장 바다", "A01011400": "항 포구 바다", "A01011600": "등대 바다",
+    "A02010100": "궁 유적", "A02010200": "성 유적", "A02010300": "유적", "A02010400": "유적", "A02010500": "유적",
+    "A02010600": "유적", "A02010700": "유적", "A02010800": "사찰",
+    "A02020300": "온천 스파", "A02020600": "테마파크",
+    "A02050200": "전망대", "A02060100": "박물관 뮤지엄", "A02060300": "전시", "A02060500": "전시",
+}
+
+# 특징을 만드는 텍스트 구성 버전 — text_of가 바뀌면 올린다
+TEXT_VERSION = 2
+
+# 키워드 목록/텍스트 구성이 바뀌면 달라지는 값 — 미리 계산해 둔 특징(spot_index)의 유효성 확인용
+FEATURE_SIGNATURE = hashlib.sha1(json.dumps([TEXT_VERSION, CATEGORIES, CAT3_HINTS], ensure_ascii=False).encode("utf-8")).hexdigest()[:12]
+
+# =========================================================
+# Compiled multi-pattern matcher
+# =========================================================
+class KeywordMatcher:
+    # 모든 힌트를 하나의 정규식으로 묶어 텍스트를 한 번만 훑는다.
+    # 카테고리별 값 = 텍스트에 "등장한 서로 다른 힌트 수" (기존 `h in txt` 합계와 동일)
+    def __init__(self, categories: tuple):
+        hints = sorted({h for hs in categories for h in hs}, key=len, reverse=True)
+        # lookahead로 모든 위치에서 (가장 긴) 힌트를 잡아 겹치는 매칭도 놓치지 않는다
+        self._pattern = re.compile("(?=(" + "|".join(map(re.escape, hints)) + "))")
+        # 같은 위치에서 시작하는 더 짧은 힌트(접두사)도 함께 등장한 것으로 처리
+        self._prefixes = {h: [p for p in hints if h.startswith(p)] for h in hints}
+        self._categories_of = {h: [i for i, hs in enumerate(categories) if h in hs] for h in hints}
+        self.size = len(categories)
+
+    def hits(self, text: str) -> set:
+        found = set()
+        for m in self._pattern.finditer(text):
+            found.update(self._prefixes[m.group(1)])
+        return found
+
+    def count_vector(self, text: str) -> tuple:
+        counts = [0] * self.size
+        for h in self.hits(text):
+            for i in self._categories_of[h]:
+                counts[i] += 1
+        return tuple(counts)
+
+MATCHER = KeywordMatcher(CATEGORIES)
+
+# =========================================================
+# Per-contentid feature cache (프로세스 전체 공유, LRU)
+# =========================================================
+FEATURE_CACHE_MAX = 20000
+_feature_cache = OrderedDict()
+_feature_lock = threading.Lock()
+
+def text_of(spot) -> str:
+    # 제목 + 주소 + 분류 힌트 + (상세 보강이 있으면) 개요 앞부분
+    return " ".join(filter(None, (
+        spot.get("title"),
+        spot.get("addr1"),
+        CAT3_HINTS.get(spot.get("cat3") or ""),
+        spot.get("overview"),
+    )))
+
+def _attach(spot, feats: tuple) -> None:
+    # Spot이면 객체에 붙여 둔다(다음부터 캐시 조회도 생략), dict면 그냥 둔다
+    try:
+        spot.features = feats
+    except AttributeError:
+        pass
+
+def spot_features(spot) -> tuple:
+    feats = getattr(spot, "features", None)
+    if feats is not None:
+        return feats
+    cid = spot.get("contentid")
+    if not cid:
+        return MATCHER.count_vector(text_of(spot))
+
+    with _feature_lock:
+        feats = _feature_cache.get(cid)
+        if feats is not None:
+            _feature_cache.move_to_end(cid)
+    if feats is None:
+        feats = MATCHER.count_vector(text_of(spot))
+        with _feature_lock:
+            _feature_cache[cid] = feats
+            if len(_feature_cache) > FEATURE_CACHE_MAX:
+                _feature_cache.popitem(last=False)
+    _attach(spot, feats)
+    return feats
+
+def refresh_features(spot) -> tuple:
+    # 텍스트가 바뀐 뒤(상세 보강) 다시 계산 — 같은 contentid의 캐시도 새 값으로
+    feats = MATCHER.count_vector(text_of(spot))
+    cid = spot.get("contentid")
+    if cid:
+        with _feature_lock:
+            _feature_cache[cid] = feats
+            _feature_cache.move_to_end(cid)
+            if len(_feature_cache) > FEATURE_CACHE_MAX:
+                _feature_cache.popitem(last=False)
+    _attach(spot, feats)
+    return feats
+
+def spot_features_many(spots: list) -> list:
+    # 후보 풀 전체를 한 번에: 락은 두 번만 잡고, 캐시에 없는 것만 매칭
+    out = [getattr(spot, "features", None) for spot in spots]
+    misses = []
+    with _feature_lock:
+        for i, spot in enumerate(spots):
+            if out[i] is not None:
+                continue
+            cid = spot.get("contentid")
+            feats = _feature_cache.get(cid) if cid else None
+            if feats is None:
+                misses.append(i)
+            else:
+                _feature_cache.move_to_end(cid)
+                out[i] = feats
+                _attach(spot, feats)
+
+    fresh = []
+    for i in misses:
+        out[i] = MATCHER.count_vector(text_of(spots[i]))
+        _attach(spots[i], out[i])
+        cid = spots[i].get("contentid")
+        if cid:
+            fresh.append((cid, out[i]))
+
+    if fresh:
+        with _feature_lock:
+            for cid, feats in fresh:
+                _feature_cache[cid] = feats
+            while len(_feature_cache) > FEATURE_CACHE_MAX:
+                _feature_cache.popitem(last=False)
+    return out
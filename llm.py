@@ -0,0 +1,160 @@
+import time
+import random
+import threading
+
+from telemetry import count
+
+# =========================================================
+# Retry policy / deadline / circuit breaker (OpenAI)
+# =========================================================
+MAX_ATTEMPTS = 3
+BACKOFF_BASE_SEC = 0.8
+BACKOFF_MAX_SEC = 4.0
+CALL_TIMEOUT_SEC = 20.0      # 호출 1번의 상한 (남은 deadline이 더 짧으면 그쪽)
+MIN_CALL_BUDGET_SEC = 1.0    # 남은 시간이 이보다 적으면 시도하지 않음
+
+BREAKER_FAILURE_THRESHOLD = 3   # 연속 실패 횟수
+BREAKER_COOLDOWN_SEC = 30.0     # open 유지 시간 → 이후 1건만 시험(half-open)
+
+class DeadlineExceeded(Exception):
+    pass
+
+class CircuitOpenError(Exception):
+    pass
+
+class Deadline:
+    # 클릭 1번(요청 1개)이 LLM에 쓸 수 있는 전체 시간 — 여러 호출/스레드가 공유
+    def __init__(self, seconds: float):
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = BREAKER_FAILURE_THRESHOLD, cooldown_sec: float = BREAKER_COOLDOWN_SEC):
+        self.failure_threshold = failure_threshold
+        self.cooldown_sec = cooldown_sec
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            return self._opened_at is not None and time.monotonic() - self._opened_at < self.cooldown_sec
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.cooldown_sec or self._probing:
+                return False
+            self._probing = True  # half-open: 시험 호출 1건만 통과
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+# 프로세스 전체에서 OpenAI 상태를 공유 (Streamlit rerun/세션과 무관)
+breaker = CircuitBreaker()
+
+def openai_healthy() -> bool:
+    return not breaker.is_open
+
+def _openai():
+    # openai 패키지는 import에 0.5초 이상 걸린다 → 실제로 호출(오류 판정)이 있을 때만 불러온다
+    import openai
+    return openai
+
+def is_retryable(err: Exception) -> bool:
+    openai = _openai()
+    if isinstance(err, (openai.APIConnectionError, openai.APITimeoutError, openai.RateLimitError)):
+        return True
+    if isinstance(err, openai.APIStatusError):
+        return err.status_code in (408, 409, 429) or err.status_code >= 500
+    return False
+
+def is_outage(err: Exception) -> bool:
+    # 연결/시간 초과/5xx — 429·4xx는 키별 문제라 차단기를 열지 않는다
+    openai = _openai()
+    if isinstance(err, (openai.APIConnectionError, openai.APITimeoutError)):
+        return True
+    return isinstance(err, openai.APIStatusError) and err.status_code >= 500
+
+def retry_after_seconds(err: Exception):
+    response = getattr(err, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        pass
+    return None
+
+def backoff_delay(attempt: int, err: Exception) -> float:
+    hinted = retry_after_seconds(err)
+    if hinted is not None:
+        return hinted
+    # full jitter
+    return random.uniform(0, min(BACKOFF_MAX_SEC, BACKOFF_BASE_SEC * (2 ** attempt)))
+
+def safe_openai_chat_create(client, deadline: Deadline = None, max_attempts: int = MAX_ATTEMPTS, **kwargs):
+    # 재시도 가능한 오류만 deadline 안에서 재시도, 치명적 오류(인증/요청 오류 등)는 바로 raise
+    deadline = deadline or Deadline(CALL_TIMEOUT_SEC * max_attempts)
+    for attempt in range(max_attempts):
+        # 남은 시간부터 본다 — allow()가 half-open 시험 호출 자리를 잡은 뒤에는 반드시 호출까지 가야 한다
+        remaining = deadline.remaining()
+        if remaining < MIN_CALL_BUDGET_SEC:
+            count("openai.deadline_exceeded")
+            raise DeadlineExceeded("OpenAI deadline exceeded")
+        if not breaker.allow():
+            count("openai.circuit_open")
+            raise CircuitOpenError("OpenAI circuit is open")
+
+        count("openai.calls")
+        try:
+            res = client.chat.completions.create(timeout=min(CALL_TIMEOUT_SEC, remaining), **kwargs)
+        except Exception as e:
+            count("openai.errors")
+            if isinstance(e, _openai().APIStatusError) and not is_outage(e):
+                breaker.record_success()  # 4xx 응답은 왔다 → OpenAI 자체는 살아 있음
+            else:
+                breaker.record_failure()
+            if not is_retryable(e) or attempt == max_attempts - 1:
+                raise
+            delay = backoff_delay(attempt, e)
+            if delay + MIN_CALL_BUDGET_SEC > deadline.remaining():
+                raise
+            count("openai.retries")
+            time.sleep(delay)
+            continue
+
+        breaker.record_success()
+        return res
+
+def stream_openai_chat(client, deadline: Deadline = None, **kwargs):
+    # stream=True 응답을 텍스트 조각 단위로 yield — 첫 응답 전까지만 위와 같은 재시도 규칙
+    stream = safe_openai_chat_create(client, deadline, stream=True, **kwargs)
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            yield delta
@@ -0,0 +1,155 @@
+import re
+
+from geo import resolve_origin
+
+# =========================================================
+# Conversation memory (토큰 예산 + 누적 요약)
+# =========================================================
+# - 최근 대화는 토큰 예산 안에서 원문 그대로
+# - 예산을 넘는 이전 대화는 "요약"으로 접어 넣는다: 핵심 정보(예산/출발지/일정...) + 짧은 메모
+# - 핵심 정보는 모든 사용자 메시지에서 한 번씩만 추출(증분)
+MEMORY_TOKEN_BUDGET = 1200
+MIN_RECENT_MESSAGES = 2
+NOTE_MAX_CHARS = 80
+NOTES_MAX_CHARS = 600
+
+FACT_LABELS = {
+    "budget": "예산",
+    "origin": "출발지",
+    "duration": "일정",
+    "dates": "날짜",
+    "people": "인원",
+    "places": "가고 싶은 지역",
+    "wishes": "하고 싶은 것",
+}
+
+BUDGET_RE = re.compile(r"(\d[\d,\.]*)\s*(만\s*원|천\s*원|원|만)")
+# "서울 출발" / "서울에서 (부산으로) 출발" — "…로 출발"의 …는 목적지라 출발지로 보지 않는다, "출발지"는 아래 규칙
+ORIGIN_RE = re.compile(r"([가-힣A-Za-z]{2,}?)(?<!로)\s*(?:에서\s*(?:[가-힣A-Za-z]+로\s*)?)?출발(?!지)")
+# "출발지는 서울이에요" / "출발지: 부산" — 뒤에 붙은 서술어(이에요/입니다 …)는 뗀다
+ORIGIN_LABEL_RE = re.compile(r"출발지\s*(?:는|은|이|가|:)?\s*([가-힣A-Za-z]{2,}?)(?:이에요|에요|예요|입니다|이고|이야|야|이요|요)?(?![가-힣A-Za-z])")
+DURATION_RE = re.compile(r"(\d+)\s*박\s*(\d+)\s*일")
+DATE_RE = re.compile(r"(\d{1,2})\s*월\s*(\d{1,2})\s*일")
+PEOPLE_RE = re.compile(r"(\d+)\s*명")
+# 대화에서 말한 목적지(출발지로 잡힌 이름은 뺀다) — 플랜 캐시 키에도 들어간다
+PLACE_KEYWORDS = [
+    "서울", "인천", "대전", "대구", "광주", "부산", "울산", "세종", "경기도", "강원", "충북", "충남", "경북", "경남", "전북", "전남", "제주",
+    "강릉", "속초", "양양", "춘천", "가평", "경주", "안동", "포항", "통영", "거제", "남해", "여수", "순천", "목포", "전주", "군산", "단양", "태안", "서귀포",
+]
+WISH_KEYWORDS = ["맛집", "카페", "전시", "뮤지엄", "온천", "스파", "야경", "등산", "캠핑", "축제", "쇼핑", "사진", "바다", "산책", "테마파크"]
+
+def estimate_tokens(text: str) -> int:
+    # tiktoken 없이 보수적으로: 한글 1자 ≈ 1토큰, 영문 3~4자 ≈ 1토큰
+    return len(text.encode("utf-8")) // 3 + 1
+
+def is_known_place(name: str) -> bool:
+    return resolve_origin(name) is not None or any(k in name for k in PLACE_KEYWORDS)
+
+def find_origin(text: str):
+    # "내일 출발" / "아침 일찍 출발"처럼 출발 앞의 아무 단어나 잡히므로, 아는 지명(출발지/지역)만 받는다
+    for pattern in (ORIGIN_LABEL_RE, ORIGIN_RE):
+        for m in pattern.finditer(text):
+            if is_known_place(m.group(1)):
+                return m.group(1)
+    return None
+
+def extract_facts(text: str) -> dict:
+    facts = {}
+    m = BUDGET_RE.search(text)
+    if m:
+        unit = m.group(2).replace(" ", "")
+        facts["budget"] = m.group(1) + ("만원" if unit == "만" else unit)
+    origin = find_origin(text)
+    if origin:
+        facts["origin"] = origin
+    m = DURATION_RE.search(text)
+    if m:
+        facts["duration"] = f"{m.group(1)}박{m.group(2)}일"
+    elif "당일" in text:
+        facts["duration"] = "당일"
+    m = DATE_RE.search(text)
+    if m:
+        facts["dates"] = f"{m.group(1)}월 {m.group(2)}일"
+    m = PEOPLE_RE.search(text)
+    if m:
+        facts["people"] = f"{m.group(1)}명"
+    places = [k for k in PLACE_KEYWORDS if k in text and k not in facts.get("origin", "")]
+    if places:
+        facts["places"] = places
+    wishes = [k for k in WISH_KEYWORDS if k in text]
+    if wishes:
+        facts["wishes"] = wishes
+    return facts
+
+class ConversationMemory:
+    def __init__(self, token_budget: int = MEMORY_TOKEN_BUDGET):
+        self.token_budget = token_budget
+        self.facts = {}
+        self.notes = []
+        self.folded = 0    # 요약으로 접힌 메시지 수 (messages[:folded])
+        self.scanned = 0   # 핵심 정보 추출을 마친 메시지 수
+
+    def update(self, messages: list) -> None:
+        # 1) 새 사용자 메시지에서 핵심 정보 추출 (나중 값이 이전 값을 덮어씀, places/wishes는 누적)
+        for m in messages[self.scanned:]:
+            if m["role"] != "user":
+                continue
+            for key, value in extract_facts(m["content"]).items():
+                if key in ("places", "wishes"):
+                    merged = self.facts.get(key, [])
+                    self.facts[key] = merged + [w for w in value if w not in merged]
+                else:
+                    self.facts[key] = value
+        self.scanned = len(messages)
+
+        # 2) 뒤에서부터 예산 안에 드는 만큼만 최근 대화로 남기고 나머지는 접는다
+        used, start = 0, len(messages)
+        while start > self.folded:
+            cost = estimate_tokens(messages[start - 1]["content"])
+            if used + cost > self.token_budget and len(messages) - start >= MIN_RECENT_MESSAGES:
+                break
+            used += cost
+            start -= 1
+        for m in messages[self.folded:start]:
+            if m["role"] == "user":
+                self._add_note(m["content"])
+        self.folded = max(self.folded, start)
+
+    def _add_note(self, text: str) -> None:
+        note = " ".join(text.split())
+        if len(note) > NOTE_MAX_CHARS:
+            note = note[: NOTE_MAX_CHARS - 1] + "…"
+        self.notes.append(note)
+        while self.notes and sum(len(n) for n in self.notes) > NOTES_MAX_CHARS:
+            self.notes.pop(0)
+
+    def fact_lines(self) -> list:
+        lines = []
+        for key, label in FACT_LABELS.items():
+            value = self.facts.get(key)
+            if value:
+                lines.append(f"{label}: {', '.join(value) if isinstance(value, list) else value}")
+        return lines
+
+    def summary_text(self) -> str:
+        if not self.facts and not self.notes:
+            return ""
+        parts = ["[지금까지 대화 요약]"]
+        parts.extend(f"- {line}" for line in self.fact_lines())
+        if self.notes:
+            parts.append("- 이전 요청: " + " / ".join(self.notes))
+        return "\n".join(parts)
+
+    def context_messages(self, messages: list) -> list:
+        # 요약(system) + 예산 안의 최근 대화
+        summary = self.summary_text()
+        recent = [{"role": m["role"], "content": m["content"]} for m in messages[self.folded:]]
+        return ([{"role": "system", "content": summary}] if summary else []) + recent
+
+    def brief(self, messages: list) -> str:
+        # 추천 이유 프롬프트용 한 줄 요약
+        parts = self.fact_lines()
+        recent_user = [m["content"] for m in messages[self.folded:] if m["role"] == "user"]
+        if recent_user:
+            parts.append("최근 요청: " + " / ".join(recent_user[-2:]))
+        return " / ".join(parts) if parts else "추가 입력 없음"
@@ -0,0 +1,169 @@
+import re
+import threading
+from collections import Counter, OrderedDict
+
+import numpy as np
+
+from keywords import (
+    CAT3_HINTS,
+    SEA_HINTS, MOUNTAIN_HINTS, CITY_HINTS,
+    PHOTO_HINTS, HISTORY_HINTS, SPA_HINTS, THEME_PARK_HINTS,
+)
+
+# =========================================================
+# Character n-gram TF-IDF similarity (키워드 포함 여부 대신 유사도로 점수)
+# =========================================================
+# - 단어마다 앞뒤에 공백을 붙여 2~3글자 조각으로 자른다 (" 설악", "악산 " …)
+#   → "해수욕장"/"해수욕" 같은 변형이나 띄어쓰기 차이도 부분적으로 맞는다
+# - 한 글자 힌트(산/항/성 …)는 글자 하나도 조각으로 → "남산타워"처럼 붙여 쓴 이름 안에서도 맞는다
+# - 주소는 쓰지 않고(모든 부산 장소가 "산"에 맞게 됨), 제목/개요의 지명(부산, 화성 …)도 지운다
+# - 장소 텍스트별 n-gram 개수는 프로세스 전체에서 한 번만 만들고(LRU), IDF는 후보 풀 기준으로 계산
+# - 풀 전체 점수 = 희소 행렬(후보 × n-gram) · 질의 행렬(n-gram × 선호) 한 번
+NGRAM_SIZES = (2, 3)
+NGRAM_ROW_CACHE_MAX = 20000
+
+# 한 글자 힌트 → 조각(1글자)으로도 쓴다
+SINGLE_CHAR_HINTS = frozenset(h for hs in (SEA_HINTS, MOUNTAIN_HINTS, CITY_HINTS, PHOTO_HINTS, HISTORY_HINTS, SPA_HINTS, THEME_PARK_HINTS) for h in hs if len(h) == 1)
+# 한 글자 힌트를 품은 시/군 이름 — 풍경/활동 단서가 아니다
+PLACE_NAMES_RE = re.compile(
+    "부산|울산|마산|군산|익산|아산|서산|안산|오산|양산|경산|논산|산청|괴산|"
+    "화성|성남|횡성|보성|곡성|음성|성주|포항"
+)
+
+# 선호 → 질의 텍스트 (키워드 목록을 그대로 문장처럼 이어 붙임)
+SCENERY_QUERIES = {
+    "바다": " ".join(SEA_HINTS),
+    "산": " ".join(MOUNTAIN_HINTS),
+    "도시": " ".join(CITY_HINTS),
+}
+ACTIVITY_QUERIES = {
+    "사진 스팟": " ".join(PHOTO_HINTS),
+    "역사,문화": " ".join(HISTORY_HINTS),
+    "온천,스파": " ".join(SPA_HINTS),
+    "테마파크": " ".join(THEME_PARK_HINTS),
+}
+
+def char_ngrams(text: str) -> list:
+    out = []
+    for word in text.split():
+        w = f" {word} "
+        for n in NGRAM_SIZES:
+            out.extend(w[i:i + n] for i in range(len(w) - n + 1))
+        out.extend(c for c in word if c in SINGLE_CHAR_HINTS)
+    return out
+
+def ngram_text(spot) -> str:
+    # 제목 + 분류 힌트 + (상세 보강이 있으면) 개요 — keywords.text_of와 달리 주소는 뺀다
+    text = " ".join(filter(None, (
+        spot.get("title"),
+        CAT3_HINTS.get(spot.get("cat3") or ""),
+        spot.get("overview"),
+    )))
+    return PLACE_NAMES_RE.sub(" ", text)
+
+# =========================================================
+# Vocabulary + per-text row cache (프로세스 전체 공유)
+# =========================================================
+# n-gram → 열 번호는 늘어나기만 한다 → 한 번 만든 행(열 번호, 개수)은 계속 유효
+_vocab = {}
+_vocab_lock = threading.Lock()
+_row_cache = OrderedDict()  # text -> (indices int32, counts float32)
+_row_lock = threading.Lock()
+_EMPTY_ROW = (np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32))
+
+def _build_row(text: str) -> tuple:
+    counts = Counter(char_ngrams(text))
+    if not counts:
+        return _EMPTY_ROW
+    with _vocab_lock:
+        cols = [_vocab.setdefault(g, len(_vocab)) for g in counts]
+    return np.asarray(cols, dtype=np.int32), np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+
+def text_rows(texts: list) -> list:
+    # 텍스트별 (열 번호, 개수) — 캐시에 없는 것만 자른다 (상세 보강으로 텍스트가 바뀌면 새 키)
+    out = [None] * len(texts)
+    misses = []
+    with _row_lock:
+        for i, text in enumerate(texts):
+            row = _row_cache.get(text)
+            if row is None:
+                misses.append(i)
+            else:
+                _row_cache.move_to_end(text)
+                out[i] = row
+    if misses:
+        fresh = [(texts[i], _build_row(texts[i])) for i in misses]
+        for i, (_, row) in zip(misses, fresh):
+            out[i] = row
+        with _row_lock:
+            for text, row in fresh:
+                _row_cache[text] = row
+            while len(_row_cache) > NGRAM_ROW_CACHE_MAX:
+                _row_cache.popitem(last=False)
+    return out
+
+def query_columns(text: str) -> dict:
+    # 질의는 어휘에 새 n-gram을 넣지 않는다(어차피 어떤 장소와도 겹치지 않음)
+    counts = Counter(char_ngrams(text))
+    with _vocab_lock:
+        return {_vocab[g]: c for g, c in counts.items() if g in _vocab}
+
+# =========================================================
+# Sparse TF-IDF matrix (CSR: data / indices / indptr, NumPy만 사용)
+# =========================================================
+class TfidfMatrix:
+    def __init__(self, texts: list):
+        rows = text_rows(texts)
+        n = len(rows)
+        lengths = np.fromiter((len(r[0]) for r in rows), dtype=np.int64, count=n)
+        self.n_rows = n
+        self.row_ids = np.repeat(np.arange(n), lengths)
+        cols = np.concatenate([r[0] for r in rows]) if n else _EMPTY_ROW[0]
+        counts = np.concatenate([r[1] for r in rows]).astype(np.float64) if n else np.zeros(0)
+
+        # 전역 열 번호 → 이 풀에 나온 열만 0..v-1로 압축
+        self.columns, self.indices = np.unique(cols, return_inverse=True)
+        df = np.bincount(self.indices, minlength=len(self.columns))    # 한 행 안에서 열은 중복되지 않음
+        self.idf = np.log((1.0 + n) / (1.0 + df)) + 1.0               # smooth idf
+
+        data = counts * self.idf[self.indices]
+        norms = np.sqrt(np.bincount(self.row_ids, weights=data * data, minlength=n))
+        self.data = data / np.where(norms > 0, norms, 1.0)[self.row_ids]  # 행별 L2 정규화
+
+    def query_matrix(self, texts: list):
+        # (v, m) — 질의마다 같은 IDF로 가중하고 L2 정규화한 열
+        v = len(self.columns)
+        q = np.zeros((v, len(texts)))
+        for j, text in enumerate(texts):
+            cols = query_columns(text)
+            if not cols or v == 0:
+                continue
+            gcols = np.fromiter(cols.keys(), dtype=np.int64, count=len(cols))
+            pos = np.minimum(np.searchsorted(self.columns, gcols), v - 1)
+            found = self.columns[pos] == gcols
+            if not found.any():
+                continue
+            weights = np.fromiter(cols.values(), dtype=np.float64, count=len(cols))[found] * self.idf[pos[found]]
+            q[pos[found], j] = weights / np.linalg.norm(weights)
+        return q
+
+    def dot(self, q):
+        # (n, v) 희소 × (v, m) 밀집 → (n, m) 코사인 유사도
+        out = np.zeros((self.n_rows, q.shape[1]))
+        prod = self.data[:, None] * q[self.indices]
+        for j in range(q.shape[1]):
+            out[:, j] = np.bincount(self.row_ids, weights=prod[:, j], minlength=self.n_rows)
+        return out
+
+    def similarity(self, query_texts: list):
+        return self.dot(self.query_matrix(query_texts))
+
+def preference_similarity(spots: list, scenery_list: list, activities: list) -> tuple:
+    # 후보별 (풍경 유사도 합, 활동 유사도 합) — (n,) 배열 두 개
+    scenery = [SCENERY_QUERIES[name] for name in dict.fromkeys(scenery_list) if name in SCENERY_QUERIES]
+    activity = [ACTIVITY_QUERIES[name] for name in dict.fromkeys(activities) if name in ACTIVITY_QUERIES]
+    n = len(spots)
+    if not scenery and not activity:
+        return np.zeros(n), np.zeros(n)
+    sims = TfidfMatrix([ngram_text(s) for s in spots]).similarity(scenery + activity)
+    return sims[:, :len(scenery)].sum(axis=1), sims[:, len(scenery):].sum(axis=1)
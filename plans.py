@@ -0,0 +1,92 @@
+import copy
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+from tourapi import AREA_NAMES
+
+# =========================================================
+# Plan schema
+# =========================================================
+# {"areas": [{"name": str, "areaCode": int}, ...(1~6개)], "style_summary": str}
+MAX_PLAN_AREAS = 6
+
+def validate_plan(obj) -> dict:
+    # LLM이 준 플랜을 검증/정규화 — 형식이 틀리면 ValueError
+    if not isinstance(obj, dict) or not isinstance(obj.get("areas"), list):
+        raise ValueError("plan must be an object with an 'areas' list")
+
+    areas, seen = [], set()
+    for area in obj["areas"]:
+        if not isinstance(area, dict):
+            continue
+        try:
+            code = int(area.get("areaCode"))
+        except (TypeError, ValueError):
+            continue
+        if code not in AREA_NAMES or code in seen:
+            continue
+        seen.add(code)
+        name = area.get("name") if isinstance(area.get("name"), str) and area.get("name") else AREA_NAMES[code]
+        areas.append({"name": name, "areaCode": code})
+        if len(areas) >= MAX_PLAN_AREAS:
+            break
+    if not areas:
+        raise ValueError("plan has no valid areaCode")
+
+    summary = obj.get("style_summary")
+    return {"areas": areas, "style_summary": summary if isinstance(summary, str) else ""}
+
+def plan_fingerprint(survey: dict, chat_facts: dict) -> str:
+    # 선택 순서/중복과 무관한 정규형 → 같은 조합이면 같은 키
+    def norm(v):
+        if isinstance(v, (list, tuple, set)):
+            return sorted({str(x).strip() for x in v if str(x).strip()})
+        return str(v).strip()
+
+    payload = {
+        "survey": {k: norm(v) for k, v in sorted(survey.items())},
+        "chat": {k: norm(v) for k, v in sorted(chat_facts.items()) if v},
+    }
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+# =========================================================
+# Plan cache (프로세스 전체 공유, TTL + LRU)
+# =========================================================
+PLAN_CACHE_TTL_SEC = 6 * 3600
+PLAN_CACHE_MAX_ENTRIES = 512
+
+class PlanCache:
+    def __init__(self, ttl_sec: float = PLAN_CACHE_TTL_SEC, max_entries: int = PLAN_CACHE_MAX_ENTRIES):
+        self.ttl_sec = ttl_sec
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._items = OrderedDict()  # key -> (plan, stored_at)
+
+    def get(self, key: str):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            plan, stored_at = item
+            if time.monotonic() - stored_at > self.ttl_sec:
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+        return copy.deepcopy(plan)  # 세션마다 독립된 사본
+
+    def set(self, key: str, plan: dict) -> None:
+        plan = validate_plan(plan)
+        with self._lock:
+            self._items[key] = (plan, time.monotonic())
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+plan_cache = PlanCache()
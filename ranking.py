@@ -0,0 +1,300 @@
+from itertools import chain
+
+import numpy as np
+
+from tourapi import filter_spots_with_images
+from spots import to_float
+from keywords import (
+    spot_features,
+    spot_features_many,
+    IDX_SEA, IDX_MOUNTAIN, IDX_CITY, IDX_ISLAND,
+    IDX_PHOTO, IDX_HISTORY, IDX_SPA, IDX_THEME_PARK,
+    CATEGORIES,
+)
+from ngram import preference_similarity
+from telemetry import span
+
+# =========================================================
+# Priority Rules: 1) 풍경 2) 교통 3) 기타
+# =========================================================
+# 풍경 선택 → 카테고리별 점수(힌트 1개당)
+SCENERY_WEIGHTS = {"바다": (IDX_SEA, 10), "산": (IDX_MOUNTAIN, 10), "도시": (IDX_CITY, 8)}
+# 활동 선택 → 관련 힌트가 하나라도 있으면 +2 (보조)
+ACTIVITY_BONUS = {"사진 스팟": IDX_PHOTO, "역사,문화": IDX_HISTORY, "온천,스파": IDX_SPA, "테마파크": IDX_THEME_PARK}
+ACTIVITY_BONUS_POINTS = 2
+SCENERY_RANK_WEIGHT = 25  # 풍경이 1순위 → 가중치 압도적으로
+
+STRICT_MIN_NONZERO = 20
+STRICT_FALLBACK_TOP = 70
+
+# n-gram 유사도 점수(scorer="ngram"): 코사인 유사도 → 키워드 점수와 비슷한 크기로
+NGRAM_SCENERY_POINTS = 100      # 유사도 0.1 ≈ 풍경 힌트 1개(10점)
+NGRAM_ACTIVITY_POINTS = 20      # 유사도 0.1 ≈ 활동 보너스 1개(2점)
+NGRAM_MIN_SIMILARITY = 0.07     # 이보다 낮은 풍경 유사도는 0점 — 벤치 스텁 풀 기준 관련 장소 최저값(≈0.08) 바로 아래
+
+# 출발지를 알면: 여행 기간 안에 못 가는 곳은 제외, 편도 1시간마다 감점(풍경 힌트 1개보다 훨씬 작게)
+TRAVEL_PENALTY_PER_HOUR = 4
+
+def excludes_islands(transport_list: list) -> bool:
+    t = set(transport_list)
+    return (("기차" in t) or ("고속버스" in t)) and ("비행기" not in t)
+
+def transport_filter(spots: list, transport_list: list) -> list:
+    if excludes_islands(transport_list):
+        return [s for s in spots if not spot_features(s)[IDX_ISLAND]]
+    return spots
+
+def travel_penalty_of(hours: float) -> int:
+    # 좌표가 없으면(nan) 감점 없음
+    if hours != hours:
+        return 0
+    return int(hours * TRAVEL_PENALTY_PER_HOUR)
+
+def spot_travel_hours(spot: dict, travel) -> float:
+    return travel.hours_one(to_float(spot.get("mapx")), to_float(spot.get("mapy")))
+
+def reachable_filter(spots: list, travel) -> list:
+    # 좌표 없는 장소(nan)는 판단할 수 없으니 남긴다
+    if travel is None:
+        return spots
+    return [s for s in spots if travel.reachable(spot_travel_hours(s, travel))]
+
+def scenery_match_score(spot: dict, scenery_list: list) -> int:
+    feats = spot_features(spot)
+    score = 0
+    for name in set(scenery_list):
+        if name in SCENERY_WEIGHTS:
+            idx, weight = SCENERY_WEIGHTS[name]
+            score += feats[idx] * weight
+    return score
+
+def scenery_strict_filter(spots: list, scenery_list: list) -> list:
+    if not scenery_list:
+        return spots
+    scored = [(scenery_match_score(s, scenery_list), s) for s in spots]
+    scored.sort(key=lambda x: x[0], reverse=True)
+
+    nonzero = [s for sc, s in scored if sc > 0]
+    if len(nonzero) >= STRICT_MIN_NONZERO:
+        return nonzero
+    return [s for _, s in scored[:STRICT_FALLBACK_TOP]]
+
+def other_preference_bonus(spot: dict, activities: list) -> int:
+    # 3순위(보조): 아주 약하게만
+    feats = spot_features(spot)
+    bonus = 0
+    for name, idx in ACTIVITY_BONUS.items():
+        if name in activities and feats[idx]:
+            bonus += ACTIVITY_BONUS_POINTS
+    return bonus
+
+def total_rank_score(spot: dict, scenery_list: list, activities: list, travel=None) -> int:
+    scenic = scenery_match_score(spot, scenery_list) * SCENERY_RANK_WEIGHT
+    bonus = other_preference_bonus(spot, activities)  # 보조
+    if travel is not None:
+        bonus -= travel_penalty_of(spot_travel_hours(spot, travel))
+    return scenic + bonus
+
+# 지역별로 풍경 점수>0 후보가 이만큼 모이면 다음 페이지를 받지 않는다
+EARLY_STOP_TARGET = 30
+
+def early_stop_rule(transport_list: list, scenery_list: list, target: int = EARLY_STOP_TARGET, travel=None):
+    # 페이지마다 호출되는 판정 함수(page -> bool): 이미지 → 교통 → 도달 가능 → 풍경 점수>0 통과 수를 누적
+    found = 0
+
+    def feed(page: list) -> bool:
+        nonlocal found
+        spots = reachable_filter(transport_filter(filter_spots_with_images(page), transport_list), travel)
+        if scenery_list:
+            found += sum(1 for s in spots if scenery_match_score(s, scenery_list) > 0)
+        else:
+            found += len(spots)
+        return found >= target
+
+    return feed
+
+def rank_pool_python(spots_by_area: list, transport_list: list, scenery_list: list, activities: list, top_k: int, travel=None) -> list:
+    # 기준 구현: 지역별 필터 → contentid 중복 제거 → 전체 정렬
+    pool, seen = [], set()
+    for spots in spots_by_area:
+        spots = filter_spots_with_images(spots)
+        spots = transport_filter(spots, transport_list)        # 2순위
+        spots = reachable_filter(spots, travel)                # 2순위(출발지 기준 도달 가능)
+        spots = scenery_strict_filter(spots, scenery_list)     # 1순위(엄격)
+        for s in spots:
+            cid = s.get("contentid")
+            if not cid or cid in seen:
+                continue
+            seen.add(cid)
+            pool.append(s)
+
+    ranked = sorted(pool, key=lambda s: total_rank_score(s, scenery_list, activities, travel), reverse=True)
+    return ranked[:top_k]
+
+def enrichment_shortlist(spots_by_area: list, transport_list: list, per_area: int, travel=None) -> list:
+    # 상세 보강 대상: 지역별로 이미지/교통/도달 가능 필터를 통과한 인기순 상위 per_area개
+    shortlist = []
+    for spots in spots_by_area:
+        spots = reachable_filter(transport_filter(filter_spots_with_images(spots), transport_list), travel)
+        shortlist.extend(spots[:per_area])
+    return shortlist
+
+# =========================================================
+# Columnar candidate table + vectorized ranking
+# =========================================================
+class CandidateTable:
+    # 후보 풀을 열(column) 단위 NumPy 배열로 보관
+    def __init__(self, spots: list, features, has_image, area, cid_code):
+        self.spots = spots
+        self.features = features      # (n, 카테고리 수) int16 — 카테고리별 힌트 수
+        self.has_image = has_image    # (n,) bool
+        self.area = area              # (n,) int32 — spots_by_area 안에서의 지역 순번
+        self.cid_code = cid_code      # (n,) int64 — contentid 정수 코드(없으면 -1)
+        self._coords = None
+
+    def __len__(self) -> int:
+        return len(self.spots)
+
+    @property
+    def coords(self):
+        # (n, 2) float64 [경도 mapx, 위도 mapy], 없으면 nan — 필요할 때만 파싱
+        if self._coords is None:
+            n = len(self.spots)
+            try:
+                # TourAPI 좌표는 숫자 문자열 아니면 빈 값 → 대부분 이 빠른 경로
+                xy = np.fromiter(
+                    (float(s.get(k) or "nan") for s in self.spots for k in ("mapx", "mapy")),
+                    dtype=np.float64, count=2 * n,
+                )
+            except (TypeError, ValueError):
+                xy = np.array([(to_float(s.get("mapx")), to_float(s.get("mapy"))) for s in self.spots], dtype=np.float64)
+            self._coords = xy.reshape(n, 2)
+        return self._coords
+
+    @property
+    def island(self):
+        return self.features[:, IDX_ISLAND] > 0
+
+    @classmethod
+    def from_areas(cls, spots_by_area: list) -> "CandidateTable":
+        spots, area = [], []
+        for i, area_spots in enumerate(spots_by_area):
+            spots.extend(area_spots)
+            area.extend([i] * len(area_spots))
+
+        n = len(spots)
+        codes = {}
+        k = len(CATEGORIES)
+        features = np.fromiter(chain.from_iterable(spot_features_many(spots)), dtype=np.int16, count=n * k).reshape(n, k)
+        has_image = np.fromiter((bool(s.get("firstimage") or s.get("firstimage2")) for s in spots), dtype=bool, count=n)
+        cid_code = np.fromiter(
+            (codes.setdefault(cid, len(codes)) if cid else -1 for cid in (s.get("contentid") for s in spots)),
+            dtype=np.int64, count=n,
+        )
+        return cls(spots, features, has_image, np.asarray(area, dtype=np.int32), cid_code)
+
+    def scenery_scores(self, scenery_list: list):
+        weights = np.zeros(self.features.shape[1], dtype=np.int32)
+        for name in set(scenery_list):
+            if name in SCENERY_WEIGHTS:
+                idx, weight = SCENERY_WEIGHTS[name]
+                weights[idx] = weight
+        return self.features @ weights
+
+    def ngram_scores(self, scenery_list: list, activities: list):
+        # (풍경 점수, 활동 보너스) — 키워드 힌트 수 대신 n-gram TF-IDF 유사도로
+        scenery_sim, activity_sim = preference_similarity(self.spots, scenery_list, activities)
+        scenic = np.where(scenery_sim >= NGRAM_MIN_SIMILARITY, scenery_sim * NGRAM_SCENERY_POINTS, 0.0)
+        return scenic, activity_sim * NGRAM_ACTIVITY_POINTS
+
+    def travel_hours(self, travel):
+        # (n,) 편도 시간 — 좌표 열 전체를 한 번에 계산
+        return travel.hours(self.coords[:, 0], self.coords[:, 1])
+
+    def activity_bonus(self, activities: list):
+        cols = [idx for name, idx in ACTIVITY_BONUS.items() if name in activities]
+        if not cols:
+            return np.zeros(len(self), dtype=np.int32)
+        return (self.features[:, cols] > 0).sum(axis=1).astype(np.int32) * ACTIVITY_BONUS_POINTS
+
+def candidate_mask(table: CandidateTable, transport_list: list, scenery_list: list, scenic, hours=None, travel=None):
+    # 이미지 → 교통/도달 가능(2순위) → 풍경 엄격 필터(1순위)를 통과한 행
+    mask = table.has_image.copy()                            # 이미지 있는 장소만
+    if excludes_islands(transport_list):                     # 2순위
+        mask &= ~table.island
+    if hours is not None:
+        mask &= travel.reachable_mask(hours)                 # 2순위(출발지 기준 도달 가능)
+
+    # 1순위(엄격): 지역별로 점수>0이 충분하면 그것만, 아니면 점수 상위 70
+    if scenery_list:
+        keep = np.zeros(len(table), dtype=bool)
+        for a in np.unique(table.area[mask]):
+            idx = np.flatnonzero(mask & (table.area == a))
+            sc = scenic[idx]
+            nonzero = idx[sc > 0]
+            if len(nonzero) >= STRICT_MIN_NONZERO:
+                keep[nonzero] = True
+            else:
+                keep[idx[np.argsort(-sc, kind="stable")[:STRICT_FALLBACK_TOP]]] = True
+        mask = keep
+    return mask
+
+def rank_pool_vectorized(table: CandidateTable, transport_list: list, scenery_list: list, activities: list, top_k: int, travel=None, scorer: str = "keyword") -> list:
+    # rank_pool_python과 같은 결과(동점 순서 포함)를 마스크/내적/부분 정렬로 계산
+    # scorer="ngram"이면 같은 필터/정렬에 풍경·활동 점수만 n-gram 유사도로 바꾼다
+    n = len(table)
+    if n == 0:
+        return []
+
+    with span("rank.score", scorer=scorer, candidates=n):
+        if scorer == "ngram":
+            scenic, bonus = table.ngram_scores(scenery_list, activities)
+        else:
+            scenic, bonus = table.scenery_scores(scenery_list), table.activity_bonus(activities)
+    with span("rank.filter") as attrs:
+        hours = table.travel_hours(travel) if travel is not None else None
+        mask = candidate_mask(table, transport_list, scenery_list, scenic, hours, travel)
+        attrs["kept"] = int(mask.sum())
+
+    idx = np.flatnonzero(mask & (table.cid_code >= 0))
+    if len(idx) == 0:
+        return []
+
+    # 풀 순서(지역 순 → 지역 안에서는 풍경 점수 내림차순) 기준으로 contentid 첫 등장만 남김
+    pool_order = idx[np.lexsort((idx, -scenic[idx], table.area[idx]))]
+    _, first = np.unique(table.cid_code[pool_order], return_index=True)
+    pool = pool_order[np.sort(first)]
+    pool_rank = np.arange(len(pool))
+
+    total = scenic[pool] * SCENERY_RANK_WEIGHT + bonus[pool]
+    if hours is not None:
+        h = hours[pool]
+        total = total - np.floor(np.nan_to_num(h, nan=0.0) * TRAVEL_PENALTY_PER_HOUR).astype(total.dtype)
+
+    # 상위 top_k 점수 컷은 partition(선형 시간)으로, 남은 후보만 (점수, 풀 순서)로 정렬
+    if len(pool) > top_k:
+        kth = np.partition(total, len(pool) - top_k)[len(pool) - top_k]
+        cand = np.flatnonzero(total >= kth)
+    else:
+        cand = pool_rank
+    order = cand[np.lexsort((pool_rank[cand], -total[cand]))][:top_k]
+    return [table.spots[i] for i in pool[order]]
+
+RANK_ENGINES = ("vector", "python")
+RANK_SCORERS = ("keyword", "ngram")
+
+def rank_pool(spots_by_area: list, transport_list: list, scenery_list: list, activities: list, top_k: int, engine: str = "vector", travel=None, scorer: str = "keyword") -> list:
+    # 출발지 기준으로 갈 수 있는 곳이 하나도 없으면 출발지 없이 다시 랭킹
+    # n-gram 점수는 풀 전체 행렬 연산이라 vector 경로만 있다
+    if engine not in RANK_ENGINES or scorer not in RANK_SCORERS:
+        raise ValueError(f"unknown rank engine/scorer: {engine!r}/{scorer!r}")
+    if engine == "python" and scorer != "ngram":
+        ranked = rank_pool_python(spots_by_area, transport_list, scenery_list, activities, top_k, travel)
+        if not ranked and travel is not None:
+            ranked = rank_pool_python(spots_by_area, transport_list, scenery_list, activities, top_k)
+        return ranked
+    table = CandidateTable.from_areas(spots_by_area)
+    ranked = rank_pool_vectorized(table, transport_list, scenery_list, activities, top_k, travel, scorer)
+    if not ranked and travel is not None:
+        ranked = rank_pool_vectorized(table, transport_list, scenery_list, activities, top_k, scorer=scorer)
+    return ranked
@@ -0,0 +1,83 @@
+import os
+import json
+import time
+import zlib
+import sqlite3
+import threading
+
+# =========================================================
+# SQLite 기반 응답 캐시 (프로세스/세션/재시작 간 공유)
+# =========================================================
+# - 값은 JSON → zlib 압축 BLOB으로 저장
+# - get()은 (값, 저장 후 경과 초)를 돌려주고, 신선도 판단(TTL/stale)은 호출 쪽에서 한다
+# - 전체 크기가 max_bytes를 넘으면 가장 오래 안 쓴 항목부터 지운다(LRU)
+
+class ResponseCache:
+    def __init__(self, path: str, max_bytes: int = 64 * 1024 * 1024, max_age_sec: float = 7 * 24 * 3600):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age_sec = max_age_sec
+        self._lock = threading.Lock()
+
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries(accessed_at)")
+
+    def get(self, key: str):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, stored_at FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+        value, stored_at = row
+        return json.loads(zlib.decompress(value)), now - stored_at
+
+    def set(self, key: str, value) -> None:
+        blob = zlib.compress(json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, stored_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now, now),
+            )
+            self._evict_locked(now)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def _evict_locked(self, now: float) -> None:
+        # 1) stale 구간까지 지난 항목 정리
+        self._conn.execute("DELETE FROM entries WHERE stored_at < ?", (now - self.max_age_sec,))
+
+        # 2) 크기 상한 초과 시 LRU 순서로 삭제
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        victims = []
+        for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY accessed_at").fetchall():
+            if total <= self.max_bytes:
+                break
+            victims.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", victims)
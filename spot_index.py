@@ -0,0 +1,142 @@
+import os
+import json
+import time
+import threading
+
+import numpy as np
+
+from keywords import CATEGORIES, FEATURE_SIGNATURE, MATCHER, text_of
+from spots import SPOT_FIELDS, Spot, to_float
+
+# =========================================================
+# Local spot index (ingest.py가 만든 스냅샷을 메모리 매핑으로 읽음)
+# =========================================================
+# 디렉터리 구성
+#   meta.json     : 버전/생성 시각/지역별 행 범위/키워드 서명
+#   features.npy  : (n, 카테고리 수) int16 — 키워드 특징 (미리 계산)
+#   coords.npy    : (n, 2) float32 — [mapx, mapy], 없으면 nan
+#   offsets.npy   : (n+1,) int64 — records.bin 안에서 각 레코드 위치
+#   records.bin   : UTF-8 JSON 레코드를 이어 붙인 것
+# 행은 지역별로 모여 있고, 지역 안에서는 인기순(arrange=P) 그대로다.
+INDEX_VERSION = 1
+INDEX_PATH = os.getenv("SPOT_INDEX_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "spot_index"))
+
+# 앱에서 쓰는 필드(SPOT_FIELDS)만 남긴다
+def strip_spot(spot) -> dict:
+    if isinstance(spot, Spot):
+        return spot.to_dict()
+    return {k: spot[k] for k in SPOT_FIELDS if spot.get(k)}
+
+class SpotIndex:
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        if self.meta.get("version") != INDEX_VERSION:
+            raise ValueError(f"unsupported spot index version: {self.meta.get('version')}")
+
+        self.features = np.load(os.path.join(path, "features.npy"), mmap_mode="r")
+        self.coords = np.load(os.path.join(path, "coords.npy"), mmap_mode="r")
+        self.offsets = np.load(os.path.join(path, "offsets.npy"), mmap_mode="r")
+        self.records = np.memmap(os.path.join(path, "records.bin"), dtype=np.uint8, mode="r") if self.offsets[-1] else b""
+        self.areas = {int(code): tuple(rng) for code, rng in self.meta["areas"].items()}
+        # 키워드 목록이 ingest 이후 바뀌었으면 미리 계산한 특징은 쓰지 않는다
+        self.features_valid = self.meta.get("feature_signature") == FEATURE_SIGNATURE
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def has_area(self, area_code) -> bool:
+        try:
+            return int(area_code) in self.areas
+        except (TypeError, ValueError):
+            return False
+
+    def record(self, row: int) -> dict:
+        start, end = int(self.offsets[row]), int(self.offsets[row + 1])
+        return json.loads(bytes(self.records[start:end]).decode("utf-8"))
+
+    def area_size(self, area_code) -> int:
+        start, end = self.areas[int(area_code)]
+        return end - start
+
+    def spots_for_area(self, area_code, limit: int = None, offset: int = 0) -> list:
+        start, end = self.areas[int(area_code)]
+        start = min(end, start + offset)
+        if limit is not None:
+            end = min(end, start + limit)
+        if not self.features_valid:
+            return [Spot.from_item(self.record(row)) for row in range(start, end)]
+        rows = self.features[start:end].tolist()
+        return [Spot.from_item(self.record(row), features=tuple(f)) for row, f in zip(range(start, end), rows)]
+
+def write_index(path: str, spots_by_area: dict) -> dict:
+    # spots_by_area: {areaCode: [원본 TourAPI dict, ...]} (지역 안 순서 유지)
+    os.makedirs(path, exist_ok=True)
+    records, features, coords, areas = [], [], [], {}
+    for code, spots in spots_by_area.items():
+        start = len(records)
+        for s in spots:
+            rec = strip_spot(s)
+            records.append(json.dumps(rec, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+            features.append(MATCHER.count_vector(text_of(rec)))
+            coords.append((to_float(rec.get("mapx")), to_float(rec.get("mapy"))))
+        areas[str(int(code))] = [start, len(records)]
+
+    n = len(records)
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    if n:
+        offsets[1:] = np.cumsum([len(r) for r in records])
+
+    # 파일별로 임시 이름에 쓰고 교체 — meta.json을 마지막에 바꿔서 읽는 쪽이 반쯤 쓴 스냅샷을 보지 않게
+    _save_npy(path, "features.npy", np.asarray(features, dtype=np.int16).reshape(n, len(CATEGORIES)))
+    _save_npy(path, "coords.npy", np.asarray(coords, dtype=np.float32).reshape(n, 2))
+    _save_npy(path, "offsets.npy", offsets)
+    _replace(path, "records.bin", b"".join(records))
+
+    meta = {
+        "version": INDEX_VERSION,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "count": n,
+        "fields": list(SPOT_FIELDS),
+        "feature_signature": FEATURE_SIGNATURE,
+        "areas": areas,
+    }
+    _replace(path, "meta.json", json.dumps(meta, ensure_ascii=False, indent=2).encode("utf-8"))
+    return meta
+
+def _save_npy(folder: str, name: str, arr) -> None:
+    tmp = os.path.join(folder, name + ".tmp")
+    with open(tmp, "wb") as f:
+        np.save(f, arr)
+    os.replace(tmp, os.path.join(folder, name))
+
+def _replace(folder: str, name: str, data: bytes) -> None:
+    tmp = os.path.join(folder, name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, os.path.join(folder, name))
+
+# =========================================================
+# Process-wide handle (ingest 후 meta.json이 바뀌면 다시 연다)
+# =========================================================
+_index = None
+_index_mtime = None
+_index_lock = threading.Lock()
+
+def get_spot_index():
+    global _index, _index_mtime
+    try:
+        mtime = os.path.getmtime(os.path.join(INDEX_PATH, "meta.json"))
+    except OSError:
+        return None
+    if mtime == _index_mtime:
+        return _index
+    with _index_lock:
+        if mtime != _index_mtime:
+            try:
+                _index = SpotIndex(INDEX_PATH)
+            except Exception:
+                _index = None
+            _index_mtime = mtime
+    return _index
@@ -0,0 +1,80 @@
+import sys
+import copy
+
+# =========================================================
+# Spot: 앱에서 쓰는 필드만 담은 가벼운 관광지 레코드
+# =========================================================
+# - TourAPI 원본 dict(필드 ~25개)를 세션마다 들고 있지 않도록 __slots__ 객체로 바꿔 둔다
+# - 문자열은 intern → 여러 세션/페이지가 같은 장소를 들고 있어도 문자열은 한 벌
+# - dict처럼 spot.get("title") / spot["title"] 로 읽을 수 있어서 필터/랭킹/카드 코드는 그대로
+SPOT_FIELDS = ("contentid", "title", "addr1", "firstimage", "firstimage2", "mapx", "mapy", "areacode", "cat3")
+_READABLE = frozenset(SPOT_FIELDS + ("overview", "travel_hours"))
+
+def _intern(value) -> str:
+    return sys.intern(str(value)) if value else ""
+
+def to_float(value) -> float:
+    # 좌표 등 숫자 문자열 → float, 비었거나 잘못된 값은 nan (랭킹/인덱스 공용)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+def _float_or_none(value):
+    value = to_float(value)
+    return None if value != value else value
+
+def _int_or_none(value):
+    try:
+        return int(value) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+class Spot:
+    __slots__ = SPOT_FIELDS + ("overview", "features", "travel_hours")
+
+    def __init__(self, contentid="", title="", addr1="", firstimage="", firstimage2="", mapx=None, mapy=None, areacode=None, cat3="", features=None):
+        self.contentid = _intern(contentid)
+        self.title = _intern(title)
+        self.addr1 = _intern(addr1)
+        self.firstimage = _intern(firstimage)
+        self.firstimage2 = _intern(firstimage2)
+        self.mapx = _float_or_none(mapx)      # 경도
+        self.mapy = _float_or_none(mapy)      # 위도
+        self.areacode = _int_or_none(areacode)
+        self.cat3 = _intern(cat3)             # 소분류 코드(예: A01011200 해수욕장)
+        self.overview = ""                    # 상세 보강(detailCommon2) 개요 앞부분 — enrich.py가 채움
+        self.features = features              # 키워드 특징(tuple) — 인덱스에서 오면 미리 채워짐, 아니면 처음 쓸 때 계산
+        self.travel_hours = None              # 출발지 기준 편도 시간(세션별, with_travel_hours로만 설정)
+
+    @classmethod
+    def from_item(cls, item, features=None) -> "Spot":
+        if isinstance(item, Spot):
+            return item
+        return cls(**{k: item.get(k) for k in SPOT_FIELDS}, features=features)
+
+    def get(self, key: str, default=None):
+        value = getattr(self, key) if key in _READABLE else None
+        return default if value is None else value
+
+    def __getitem__(self, key: str):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def to_dict(self) -> dict:
+        # 원본 dict 형태(빈 값 제외) — 인덱스 저장용
+        return {k: getattr(self, k) for k in SPOT_FIELDS if getattr(self, k) not in (None, "")}
+
+    def with_travel_hours(self, hours) -> "Spot":
+        # 세션마다 다른 값이라 사본에만 기록
+        spot = copy.copy(self)
+        spot.travel_hours = hours
+        return spot
+
+    def __repr__(self) -> str:
+        return f"Spot({self.contentid!r}, {self.title!r})"
+
+def spots_from_items(items: list) -> list:
+    return [Spot.from_item(item) for item in items if isinstance(item, (dict, Spot))]
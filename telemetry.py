@@ -0,0 +1,192 @@
+import os
+import sys
+import json
+import time
+import uuid
+import logging
+import argparse
+import threading
+import contextvars
+from collections import Counter, deque
+from contextlib import contextmanager
+
+import numpy as np
+
+# =========================================================
+# Telemetry (클릭 1번 = trace 1개, 단계마다 span + 카운터)
+# =========================================================
+# - span: 단계 이름 + 소요 시간(ms) + 속성(지역 코드, 출처 등)
+# - 카운터: 재시도 / 캐시 적중 / fallback 사용 횟수 등 — 하위 모듈(llm, tourapi …)은 count()만 부른다
+# - 현재 trace는 contextvar로 전달 → 작업 스레드에 넘길 때는 bind()로 감싼다
+# - trace가 끝나면 JSON 한 줄로 로그(TELEMETRY_LOG) + 최근 trace를 프로세스 메모리에 보관(디버그 패널 p50/p95)
+TELEMETRY_LOG = os.getenv("TELEMETRY_LOG", "")   # "" 끔 / "-" 표준 에러 / 그 외 파일 경로(JSON lines)
+RECENT_TRACES_MAX = 200
+
+_current = contextvars.ContextVar("telemetry_trace", default=None)
+_recent = deque(maxlen=RECENT_TRACES_MAX)
+_recent_lock = threading.Lock()
+
+logger = logging.getLogger("telemetry")
+logger.propagate = False
+logger.setLevel(logging.INFO)
+
+def _log_handler(path: str) -> logging.Handler:
+    # 로그 파일을 열 수 없으면(권한/읽기 전용 디스크 등) 앱을 멈추지 않고 표준 에러로
+    if path == "-":
+        return logging.StreamHandler(sys.stderr)
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        return logging.FileHandler(path, encoding="utf-8")
+    except OSError as e:
+        print(f"telemetry: TELEMETRY_LOG={path} 열기 실패({e}) — 표준 에러로 기록", file=sys.stderr)
+        return logging.StreamHandler(sys.stderr)
+
+if TELEMETRY_LOG and not logger.handlers:
+    _handler = _log_handler(TELEMETRY_LOG)
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+
+class Trace:
+    def __init__(self, name: str):
+        self.name = name
+        self.trace_id = uuid.uuid4().hex[:12]
+        self.started_at = time.time()
+        self.total_ms = None
+        self.spans = []            # [(이름, ms, 속성), ...] 끝난 순서
+        self.counters = Counter()
+        self._t0 = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self) -> bool:
+        return self.total_ms is not None
+
+    def add_span(self, name: str, ms: float, attrs: dict) -> None:
+        # trace가 끝난 뒤에 끝난 작업(마감 시간을 넘긴 스레드)은 기록하지 않는다
+        with self._lock:
+            if not self.finished:
+                self.spans.append((name, round(ms, 1), attrs))
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            if not self.finished:
+                self.counters[name] += n
+
+    def finish(self) -> None:
+        with self._lock:
+            self.total_ms = round((time.perf_counter() - self._t0) * 1000, 1)
+
+    def to_dict(self) -> dict:
+        return {
+            "event": "trace",
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "ts": round(self.started_at, 3),
+            "total_ms": self.total_ms,
+            "spans": [{"name": n, "ms": ms, **attrs} for n, ms, attrs in self.spans],
+            "counters": dict(self.counters),
+        }
+
+@contextmanager
+def trace(name, on_finish=None):
+    # name이 비어 있으면 기록하지 않는다(버튼을 누르지 않은 rerun 등)
+    # on_finish(trace): 중간에 return/예외로 빠져나가도 끝날 때 한 번 불린다
+    if not name:
+        yield None
+        return
+    tr = Trace(name)
+    token = _current.set(tr)
+    try:
+        yield tr
+    finally:
+        _current.reset(token)
+        tr.finish()
+        with _recent_lock:
+            _recent.append(tr)
+        if on_finish is not None:
+            on_finish(tr)
+        if logger.handlers:
+            logger.info(json.dumps(tr.to_dict(), ensure_ascii=False, default=str))
+
+@contextmanager
+def span(name: str, **attrs):
+    # with span("rank") as attrs: ... attrs["pool"] = 30 처럼 속성을 나중에 채워도 된다
+    tr = _current.get()
+    if tr is None:
+        yield attrs
+        return
+    t0 = time.perf_counter()
+    try:
+        yield attrs
+    except BaseException as e:
+        attrs["error"] = type(e).__name__
+        raise
+    finally:
+        tr.add_span(name, (time.perf_counter() - t0) * 1000, attrs)
+
+def count(name: str, n: int = 1) -> None:
+    tr = _current.get()
+    if tr is not None:
+        tr.count(name, n)
+
+def bind(fn):
+    # 작업 스레드에서도 지금 trace에 기록되도록 — submit 할 때마다 새로 감싼다(context는 동시에 한 스레드만 run 가능)
+    ctx = contextvars.copy_context()
+    return lambda *args, **kwargs: ctx.run(fn, *args, **kwargs)
+
+# =========================================================
+# Aggregation (p50/p95)
+# =========================================================
+def stage_percentiles(traces: list) -> dict:
+    # {단계: (횟수, p50 ms, p95 ms)} — trace 전체 시간은 "<trace 이름>" 키로
+    samples = {}
+    for tr in traces:
+        samples.setdefault(f"<{tr['name']}>", []).append(tr["total_ms"])
+        for s in tr["spans"]:
+            samples.setdefault(s["name"], []).append(s["ms"])
+    return {
+        name: (len(values), float(np.percentile(values, 50)), float(np.percentile(values, 95)))
+        for name, values in sorted(samples.items())
+    }
+
+def recent_traces() -> list:
+    with _recent_lock:
+        return [tr.to_dict() for tr in _recent]
+
+def read_log(path: str) -> list:
+    traces = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                obj = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(obj, dict) and obj.get("event") == "trace":
+                traces.append(obj)
+    return traces
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="TELEMETRY_LOG(JSON lines)를 읽어 단계별 p50/p95 지연 시간을 출력합니다.")
+    parser.add_argument("log", help="TELEMETRY_LOG 파일 경로")
+    parser.add_argument("--name", default=None, help="이 이름의 trace만 (예: recommend, reroll)")
+    args = parser.parse_args(argv)
+
+    traces = [t for t in read_log(args.log) if args.name is None or t["name"] == args.name]
+    if not traces:
+        print("trace 없음")
+        return 1
+    counters = Counter()
+    for t in traces:
+        counters.update(t.get("counters", {}))
+
+    print(f"{'stage':<24}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}")
+    for name, (n, p50, p95) in stage_percentiles(traces).items():
+        print(f"{name:<24}{n:>6}{p50:>10.1f}{p95:>10.1f}")
+    if counters:
+        print()
+        for name, value in sorted(counters.items()):
+            print(f"{name:<32}{value:>8}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
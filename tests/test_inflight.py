@@ -0,0 +1,31 @@
+import os
+import sys
+from concurrent.futures import Future, ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from inflight import PendingFutures
+
+# =========================================================
+# PendingFutures
+# =========================================================
+class InlineExecutor:
+    # submit 안에서 바로 실행 → add_done_callback 시점에 이미 끝난 Future
+    def submit(self, fn, *args):
+        fut = Future()
+        fut.set_result(fn(*args))
+        return fut
+
+def test_done_before_callback_does_not_deadlock():
+    pending = PendingFutures(InlineExecutor())
+    assert pending.submit("a", lambda x: x * 2, 21).result(timeout=1) == 42
+    assert pending.get("a") is None and len(pending) == 0
+
+def test_same_key_shares_future_and_respects_limit():
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        gate = Future()
+        pending = PendingFutures(executor, max_pending=1)
+        first = pending.submit("a", gate.result)
+        assert pending.submit("a", gate.result) is first
+        assert pending.submit("b", gate.result) is None
+        gate.set_result("ok")
+        assert first.result(timeout=1) == "ok"
@@ -0,0 +1,41 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "bench"))
+import ingest
+import stub_tourapi
+import tourapi
+from spot_index import SpotIndex
+
+# =========================================================
+# Ingest against the bench TourAPI stub (HTTP 200 오류 응답 포함)
+# =========================================================
+@pytest.fixture
+def stub(monkeypatch):
+    server = stub_tourapi.serve(0, latency_ms=0, jitter_ms=0, rows_per_area=300)
+    monkeypatch.setattr(tourapi, "TOUR_BASE", server.base_url)
+    monkeypatch.setattr(ingest, "RETRY_BASE_SEC", 0)
+    yield server
+    server.shutdown()
+
+def run_ingest(out: str) -> int:
+    return ingest.main(["--out", out, "--areas", "6", "--page-size", "100", "--service-key", "test"])
+
+def test_errors_keep_previous_snapshot(stub, tmp_path):
+    out = str(tmp_path / "index")
+    assert run_ingest(out) == 0
+    assert SpotIndex(out).area_size(6) == 300
+
+    # 트래픽 초과(resultCode 22) / HTTP 500만 돌아오면 실패로 끝나고 이전 300곳을 유지
+    stub.config["error_rate"] = 1.0
+    assert run_ingest(out) == 1
+    assert SpotIndex(out).area_size(6) == 300
+
+def test_empty_pages_with_total_count_fail(monkeypatch):
+    monkeypatch.setattr(ingest, "fetch_page", lambda *args: stub_tourapi.envelope([], 300, 100, 1))
+    with pytest.raises(ValueError):
+        ingest.fetch_all_spots(6, "test", page_size=100)
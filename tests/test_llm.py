@@ -0,0 +1,57 @@
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import llm
+from llm import CircuitBreaker, CircuitOpenError, Deadline, DeadlineExceeded, safe_openai_chat_create
+
+# =========================================================
+# Circuit breaker half-open 경로 (가짜 client — 네트워크 없음)
+# =========================================================
+class FakeClient:
+    def __init__(self, error: Exception = None):
+        self.calls = 0
+        self.error = error
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return "ok"
+
+@pytest.fixture
+def half_open(monkeypatch):
+    # 연속 실패로 열린 뒤 cooldown이 지난 상태(다음 allow()가 시험 호출 1건)
+    cb = CircuitBreaker(failure_threshold=1, cooldown_sec=30)
+    cb.record_failure()
+    cb._opened_at -= cb.cooldown_sec + 1
+    monkeypatch.setattr(llm, "breaker", cb)
+    return cb
+
+def test_deadline_exceeded_does_not_take_probe(half_open):
+    client = FakeClient()
+    with pytest.raises(DeadlineExceeded):
+        safe_openai_chat_create(client, Deadline(0))
+    assert client.calls == 0
+    assert not half_open._probing
+
+    # 시험 호출 자리가 남아 있으므로 다음 요청이 통과하고 차단기가 닫힌다
+    assert safe_openai_chat_create(client, Deadline(10)) == "ok"
+    assert client.calls == 1
+    assert half_open._opened_at is None
+
+def test_probe_failure_reopens(half_open):
+    pytest.importorskip("openai")  # 오류 분류(_openai)에 필요
+    client = FakeClient(ConnectionError("connection reset"))
+    with pytest.raises(ConnectionError):
+        safe_openai_chat_create(client, Deadline(10))
+    assert client.calls == 1
+    assert half_open.is_open and not half_open._probing
+
+    with pytest.raises(CircuitOpenError):
+        safe_openai_chat_create(client, Deadline(10))
+    assert client.calls == 1
@@ -0,0 +1,44 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from memory import ConversationMemory, extract_facts
+from plans import plan_fingerprint
+
+# =========================================================
+# 출발지 추출 (ORIGIN_RE / ORIGIN_LABEL_RE)
+# =========================================================
+@pytest.mark.parametrize("text, origin", [
+    ("서울 출발이에요", "서울"),
+    ("내일 아침 강남에서 출발할게요", "강남"),
+    ("서울에서 부산으로 출발해요", "서울"),
+    ("출발지는 서울이에요", "서울"),
+    ("출발지: 부산", "부산"),
+    ("우리 출발지는 대전입니다", "대전"),
+    ("출발지는 서울역이에요, 예산 30만원", "서울역"),
+])
+def test_origin(text, origin):
+    assert extract_facts(text).get("origin") == origin
+
+@pytest.mark.parametrize("text", ["부산으로 출발해요", "내일 출발해요", "금요일 아침 출발", "다같이 출발할 예정", "토요일 아침 일찍 출발할게요"])
+def test_no_origin(text):
+    assert "origin" not in extract_facts(text)
+
+def test_later_time_word_keeps_origin():
+    memory = ConversationMemory()
+    memory.update([{"role": "user", "content": "서울 출발이에요"}, {"role": "user", "content": "토요일 아침 일찍 출발할게요"}])
+    assert memory.facts["origin"] == "서울"
+
+# =========================================================
+# 대화에서 말한 목적지 → 플랜 캐시 키
+# =========================================================
+def test_places_change_plan_key():
+    survey = {"scenery": ["바다"], "transport": ["기차"]}
+    memory = ConversationMemory()
+    memory.update([{"role": "user", "content": "서울에서 출발해요"}])
+    before = plan_fingerprint(survey, memory.facts)
+    memory.update([{"role": "user", "content": "서울에서 출발해요"}, {"role": "user", "content": "강릉 바다 보고 싶어요"}])
+    assert memory.facts["places"] == ["강릉"]
+    assert plan_fingerprint(survey, memory.facts) != before
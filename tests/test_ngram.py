@@ -0,0 +1,49 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "bench"))
+from ngram import preference_similarity
+from ranking import NGRAM_MIN_SIMILARITY, CandidateTable
+from spots import spots_from_items
+from stub_tourapi import make_item
+
+# =========================================================
+# n-gram 풍경 유사도: 지명 속 "산"(부산) vs 산 이름(남산/설악산)
+# =========================================================
+NAMED = [
+    ("부산시립미술관", "A02060500", "부산 해운대구 58"),
+    ("해운대해수욕장", "A01011200", "부산 해운대구 58"),
+    ("남산타워", "A02050200", "서울 용산구 105"),
+    ("설악산", "A01010100", "강원 속초시 설악산로 833"),
+]
+
+@pytest.fixture(scope="module")
+def pool():
+    # IDF가 실제 풀과 비슷하도록 스텁 관광지 사이에 섞는다
+    items = [make_item(area, n) for area in (1, 6, 32) for n in range(200)]
+    items += [
+        {"contentid": f"named{i}", "title": title, "cat3": cat3, "addr1": addr, "firstimage": "x", "mapx": "127", "mapy": "37", "areacode": "1"}
+        for i, (title, cat3, addr) in enumerate(NAMED)
+    ]
+    return spots_from_items(items)
+
+def named_scores(pool, values) -> dict:
+    return {title: float(v) for (title, _, _), v in zip(NAMED, values[-len(NAMED):])}
+
+def test_mountain_similarity_ordering(pool):
+    scenery, _ = preference_similarity(pool, ["산"], [])
+    sim = named_scores(pool, scenery)
+    busan = max(sim["부산시립미술관"], sim["해운대해수욕장"])
+    assert busan < NGRAM_MIN_SIMILARITY
+    assert sim["남산타워"] > busan
+    assert sim["설악산"] >= NGRAM_MIN_SIMILARITY
+
+def test_busan_gets_no_mountain_points(pool):
+    scenic, _ = CandidateTable.from_areas([pool]).ngram_scores(["산"], [])
+    points = named_scores(pool, scenic)
+    assert points["부산시립미술관"] == 0 and points["해운대해수욕장"] == 0
+    assert points["설악산"] > 0
@@ -0,0 +1,53 @@
+import os
+import sys
+import random
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from geo import TravelModel
+from keywords import CATEGORIES
+from ranking import rank_pool
+
+# =========================================================
+# vector 엔진 == python 엔진 (동점 순서 포함, 무작위 풀 200개)
+# =========================================================
+WORDS = sorted({h for hs in CATEGORIES for h in hs}) + ["부산", "서울", "공원", "마을", "x"]
+SCENERY = [[], ["바다"], ["산"], ["도시"], ["바다", "산"], ["바다", "산", "도시"]]
+TRANSPORT = [["기차"], ["비행기"], ["자동차"], ["고속버스", "비행기"]]
+ACTIVITIES = [[], ["사진 스팟"], ["역사,문화", "온천,스파", "테마파크"]]
+
+def random_area(rng: random.Random, area: int, n: int) -> list:
+    # contentid 없음 / 지역 간 중복 / 이미지 없음 / 좌표 없음이 섞인 풀
+    out = []
+    for i in range(n):
+        cid = f"{area}-{i}" if rng.random() > 0.02 else ""
+        if rng.random() < 0.05:
+            cid = f"{rng.randint(0, 3)}-{rng.randint(0, 50)}"
+        out.append({
+            "contentid": cid,
+            "title": "".join(rng.choice(WORDS) for _ in range(rng.randint(0, 3))),
+            "addr1": rng.choice(["부산 해운대구", "강원 속초시", "서울 중구", "경북 울릉군", ""]),
+            "firstimage": "x" if rng.random() > 0.3 else "",
+            "mapx": rng.choice(["", f"{rng.uniform(126, 129.5):.6f}"]),
+            "mapy": f"{rng.uniform(33, 38):.6f}",
+        })
+    return out
+
+@pytest.mark.parametrize("seed", range(200))
+def test_vector_matches_python(seed):
+    rng = random.Random(seed)
+    areas = [random_area(rng, a, rng.randint(0, 200)) for a in range(rng.randint(0, 6))]
+    transport, scenery, activities = rng.choice(TRANSPORT), rng.choice(SCENERY), rng.choice(ACTIVITIES)
+    top_k = rng.choice([3, 30, 80])
+    travel = TravelModel.build(rng.choice([None, "서울", "부산", "제주"]), transport, [rng.choice(["당일여행", "1박 2일", "3박 이상"])])
+
+    expected = rank_pool(areas, transport, scenery, activities, top_k=top_k, engine="python", travel=travel)
+    actual = rank_pool(areas, transport, scenery, activities, top_k=top_k, engine="vector", travel=travel)
+    assert [id(s) for s in actual] == [id(s) for s in expected]
+
+def test_unknown_engine_or_scorer():
+    with pytest.raises(ValueError):
+        rank_pool([], ["기차"], ["바다"], [], top_k=3, scorer="ngarm")
+    with pytest.raises(ValueError):
+        rank_pool([], ["기차"], ["바다"], [], top_k=3, engine="vectr")
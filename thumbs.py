@@ -0,0 +1,152 @@
+import os
+import io
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import requests
+from PIL import Image, ImageOps
+
+from inflight import PendingFutures, SharedSession, SingleFlight
+
+# =========================================================
+# Thumbnail cache (원본 이미지를 카드 크기로 줄여 디스크에 보관)
+# =========================================================
+# - 키: 원본 URL의 sha1 + 크기/품질 → 같은 URL은 프로세스/세션과 무관하게 한 번만 받음
+# - 카드에는 로컬 썸네일 경로를 넘기고, 실패하면 원본 URL 그대로
+THUMB_DIR = os.getenv("THUMB_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "thumbs"))
+THUMB_WIDTH = 720              # 3열 카드 기준 2x 해상도
+THUMB_QUALITY = 78
+THUMB_MAX_SOURCE_BYTES = 15 * 1024 * 1024
+THUMB_CACHE_MAX_BYTES = 256 * 1024 * 1024
+THUMB_PRUNE_EVERY = 50         # 새 썸네일 이만큼 쓸 때마다 용량 정리
+DOWNLOAD_TIMEOUT_SEC = 8
+THUMB_WAIT_SEC = 2.0           # 결과 카드를 그리기 전에 썸네일을 기다리는 전체 상한
+PREFETCH_WORKERS = 4
+THUMB_FAIL_TTL_SEC = 600       # 실패한 URL은 잠시 다시 시도하지 않음(카드가 매번 기다리지 않게)
+
+_session = SharedSession(pool_connections=2, pool_maxsize=PREFETCH_WORKERS * 2)
+_inflight = SingleFlight()
+_pending = PendingFutures(ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="thumb"))  # url -> Future (prefetch 중)
+_written = 0
+_failed = {}   # url -> 실패 시각
+
+def get_session() -> requests.Session:
+    return _session.get()
+
+def thumb_path(url: str) -> str:
+    digest = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    return os.path.join(THUMB_DIR, digest[:2], f"{digest}_{THUMB_WIDTH}q{THUMB_QUALITY}.jpg")
+
+def make_thumbnail(data: bytes) -> bytes:
+    img = Image.open(io.BytesIO(data))
+    img.draft("RGB", (THUMB_WIDTH, THUMB_WIDTH))  # JPEG는 디코딩 단계에서 미리 축소
+    img = ImageOps.exif_transpose(img)
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+    if img.width > THUMB_WIDTH:
+        img = img.resize((THUMB_WIDTH, max(1, round(img.height * THUMB_WIDTH / img.width))), Image.LANCZOS)
+    out = io.BytesIO()
+    img.save(out, "JPEG", quality=THUMB_QUALITY, optimize=True, progressive=True)
+    return out.getvalue()
+
+def _download(url: str, timeout: float) -> bytes:
+    with get_session().get(url, timeout=timeout, stream=True) as r:
+        r.raise_for_status()
+        chunks, size = [], 0
+        for chunk in r.iter_content(64 * 1024):
+            size += len(chunk)
+            if size > THUMB_MAX_SOURCE_BYTES:
+                raise ValueError(f"image too large: {url}")
+            chunks.append(chunk)
+    return b"".join(chunks)
+
+def _build(url: str, timeout: float) -> str:
+    global _written
+    path = thumb_path(url)
+    if os.path.exists(path):
+        return path
+    thumb = make_thumbnail(_download(url, timeout))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(thumb)
+    os.replace(tmp, path)
+
+    _written += 1
+    if _written % THUMB_PRUNE_EVERY == 0:
+        prune_cache()
+    return path
+
+def get_thumbnail(url: str, timeout: float = DOWNLOAD_TIMEOUT_SEC):
+    # 로컬 썸네일 경로, 실패하면 None (같은 URL 동시 요청은 한 번만 받음)
+    if not url:
+        return None
+    path = thumb_path(url)
+    if os.path.exists(path):
+        return path
+    failed_at = _failed.get(url)
+    if failed_at is not None and time.monotonic() - failed_at < THUMB_FAIL_TTL_SEC:
+        return None
+    try:
+        value, _ = _inflight.do(url, lambda: _build(url, timeout))
+        _failed.pop(url, None)
+        return value
+    except Exception:
+        _failed[url] = time.monotonic()
+        return None
+
+def prefetch_thumbnails(urls: list) -> None:
+    # 백그라운드에서 미리 받아 둔다 (이유 생성과 겹치게) — 이미 있거나 받는 중이면 건너뜀
+    for url in dict.fromkeys(u for u in urls if u):
+        if not os.path.exists(thumb_path(url)):
+            _pending.submit(url, get_thumbnail, url)
+
+def wait_for(urls: list, timeout: float = THUMB_WAIT_SEC) -> None:
+    # 화면에 나갈 카드 이미지들을 한꺼번에 기다린다(전체 상한 timeout) — 못 받은 건 원본 URL로
+    prefetch_thumbnails(urls)
+    futures = [f for f in (_pending.get(u) for u in urls if u) if f is not None]
+    if futures:
+        wait(futures, timeout=timeout)
+
+def card_image(url: str):
+    # 카드에 넘길 이미지: 준비된 썸네일 경로, 아니면 원본 URL (여기서는 기다리지 않음)
+    if not url:
+        return None
+    path = thumb_path(url)
+    if os.path.exists(path):
+        touch(path)
+        return path
+    return url
+
+def prune_cache(max_bytes: int = THUMB_CACHE_MAX_BYTES) -> None:
+    # 오래 안 쓴(수정 시각 기준) 파일부터 지워 상한 아래로
+    files = []
+    for root, _, names in os.walk(THUMB_DIR):
+        for name in names:
+            p = os.path.join(root, name)
+            try:
+                info = os.stat(p)
+            except OSError:
+                continue
+            files.append((info.st_mtime, info.st_size, p))
+    total = sum(size for _, size, _ in files)
+    if total <= max_bytes:
+        return
+    for _, size, p in sorted(files):
+        try:
+            os.remove(p)
+        except OSError:
+            continue
+        total -= size
+        if total <= max_bytes:
+            break
+
+def touch(path: str) -> None:
+    # 캐시 적중 시 수정 시각을 갱신해서 prune 순서를 LRU에 가깝게
+    try:
+        now = time.time()
+        os.utime(path, (now, now))
+    except OSError:
+        pass
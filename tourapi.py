@@ -0,0 +1,295 @@
+import os
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import requests
+
+from inflight import ByteLRU, SharedSession, SingleFlight
+from response_cache import ResponseCache
+from spot_index import get_spot_index
+from spots import spots_from_items
+from telemetry import bind, count, span
+
+# =========================================================
+# TourAPI Constants
+# =========================================================
+TOUR_BASE = os.getenv("TOUR_BASE_URL", "https://apis.data.go.kr/B551011/KorService2")  # 벤치마크에서는 로컬 스텁 주소
+CONTENT_TYPE_TOUR = 12  # 관광지
+
+# areaCode 참고
+AREA_NAMES = {
+    1: "서울", 2: "인천", 3: "대전", 4: "대구", 5: "광주", 6: "부산", 7: "울산", 8: "세종",
+    31: "경기", 32: "강원", 33: "충북", 34: "충남", 35: "경북", 36: "경남", 37: "전북", 38: "전남", 39: "제주",
+}
+
+# 동시 요청 상한 / 클릭 1회당 전체 마감 시간(초)
+FETCH_MAX_WORKERS = 6
+FETCH_DEADLINE_SEC = 10.0
+REQUEST_TIMEOUT_SEC = 25
+
+# 페이지 단위 스트리밍: 조기 종료 규칙이 있으면 STREAM_MAX_ROWS까지 이어서 받는다
+STREAM_PAGE_SIZE = 100
+STREAM_MAX_ROWS = 500
+
+# 관광지 목록 출처: auto(로컬 인덱스에 있으면 인덱스, 없으면 API) / index / api
+SPOT_SOURCE = os.getenv("SPOT_SOURCE", "auto")
+
+# 디스크 캐시: TTL 안은 그대로 사용, TTL~STALE 구간은 먼저 돌려주고 백그라운드 갱신
+CACHE_PATH = os.getenv("TOUR_CACHE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "tourapi.sqlite3"))
+CACHE_TTL_SEC = 12 * 3600
+CACHE_STALE_SEC = 7 * 24 * 3600
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+# 프로세스 메모리 캐시(디스크 앞단) — 모든 세션이 공유
+MEMORY_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+# =========================================================
+# HTTP Session (keep-alive, 프로세스 단위로 재사용 — inflight.SharedSession)
+# =========================================================
+_session = SharedSession(pool_connections=4, pool_maxsize=FETCH_MAX_WORKERS * 2)
+
+def get_session() -> requests.Session:
+    return _session.get()
+
+# =========================================================
+# Response cache (serviceKey 제외한 endpoint + params 기준)
+# =========================================================
+_cache = None
+_cache_lock = threading.Lock()
+_revalidating = set()
+_revalidating_lock = threading.Lock()
+
+# 세션들이 동시에 같은 요청을 하면 한 번만 보내고 결과를 나눠 받는다.
+# 메모리 캐시의 dict는 여러 세션이 공유하므로 호출 쪽에서 수정하지 않는다.
+_inflight = SingleFlight()
+_memory = ByteLRU(MEMORY_CACHE_MAX_BYTES)
+
+def get_cache():
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                try:
+                    _cache = ResponseCache(CACHE_PATH, max_bytes=CACHE_MAX_BYTES, max_age_sec=CACHE_TTL_SEC + CACHE_STALE_SEC)
+                except Exception:
+                    # 읽기 전용 디스크 등 → 캐시 없이 동작
+                    _cache = False
+    return _cache or None
+
+def cache_key(endpoint: str, params: dict) -> str:
+    norm = {str(k): str(v) for k, v in params.items() if k != "serviceKey"}
+    return endpoint + "?" + json.dumps(norm, sort_keys=True, ensure_ascii=False)
+
+def is_cacheable(data: dict) -> bool:
+    # TourAPI는 키 오류/트래픽 초과도 HTTP 200 + 오류 코드로 내려준다
+    try:
+        return data["response"]["header"]["resultCode"] == "0000"
+    except Exception:
+        return isinstance(data, dict) and "body" in data.get("response", {})
+
+# =========================================================
+# TourAPI
+# =========================================================
+def _request_json(endpoint: str, params: dict, service_key: str, timeout: float) -> dict:
+    url = f"{TOUR_BASE}/{endpoint}"
+    base_params = {
+        "serviceKey": service_key,
+        "MobileOS": "ETC",
+        "MobileApp": "MyTravelApp",
+        "_type": "json",
+    }
+    base_params.update(params)
+
+    r = get_session().get(url, params=base_params, timeout=timeout)
+    r.raise_for_status()
+    return r.json()
+
+def _remember(key: str, data: dict, stored_at: float) -> None:
+    size = len(json.dumps(data, ensure_ascii=False).encode("utf-8"))
+    _memory.set(key, (data, stored_at), size)
+
+def _store(key: str, data: dict) -> None:
+    if not is_cacheable(data):
+        return
+    _remember(key, data, time.time())
+    cache = get_cache()
+    if cache is None:
+        return
+    try:
+        cache.set(key, data)
+    except Exception:
+        pass
+
+def _revalidate(key: str, endpoint: str, params: dict, service_key: str) -> None:
+    try:
+        _store(key, _request_json(endpoint, params, service_key, REQUEST_TIMEOUT_SEC))
+    except Exception:
+        pass
+    finally:
+        with _revalidating_lock:
+            _revalidating.discard(key)
+
+def _revalidate_in_background(key: str, endpoint: str, params: dict, service_key: str) -> None:
+    with _revalidating_lock:
+        if key in _revalidating:
+            return
+        _revalidating.add(key)
+    threading.Thread(target=_revalidate, args=(key, endpoint, dict(params), service_key), daemon=True).start()
+
+def _load(key: str, endpoint: str, params: dict, service_key: str, timeout: float) -> dict:
+    cache = get_cache()
+    if cache is not None:
+        try:
+            hit = cache.get(key)
+        except Exception:
+            hit = None
+        if hit is not None:
+            data, age = hit
+            if age < CACHE_TTL_SEC:
+                count("tourapi.cache.disk")
+                _remember(key, data, time.time() - age)
+                return data
+            if age < CACHE_TTL_SEC + CACHE_STALE_SEC:
+                count("tourapi.cache.stale")
+                _revalidate_in_background(key, endpoint, params, service_key)
+                return data
+
+    count("tourapi.requests")
+    data = _request_json(endpoint, params, service_key, timeout)
+    _store(key, data)
+    return data
+
+def tourapi_get(endpoint: str, params: dict, service_key: str, timeout: float = REQUEST_TIMEOUT_SEC, use_cache: bool = True) -> dict:
+    if not use_cache:
+        count("tourapi.requests")
+        return _request_json(endpoint, params, service_key, timeout)
+
+    # 1) 메모리 → 2) 디스크 → 3) 네트워크 (2~3은 같은 키끼리 한 번만)
+    key = cache_key(endpoint, params)
+    hit = _memory.get(key)
+    if hit is not None and time.time() - hit[1] < CACHE_TTL_SEC:
+        count("tourapi.cache.memory")
+        return hit[0]
+
+    data, shared = _inflight.do(key, lambda: _load(key, endpoint, params, service_key, timeout))
+    if shared:
+        count("tourapi.inflight_shared")
+    if shared and not is_cacheable(data):
+        # 다른 세션의 키 오류 응답을 그대로 받지 않도록 내 키로 다시 요청
+        data = _request_json(endpoint, params, service_key, timeout)
+    return data
+
+def safe_items(data: dict) -> list:
+    try:
+        items = data["response"]["body"]["items"]["item"]
+        if isinstance(items, dict):
+            return [items]
+        return items
+    except Exception:
+        return []
+
+def local_index_available() -> bool:
+    return SPOT_SOURCE != "api" and get_spot_index() is not None
+
+def iter_spot_pages(area_code, service_key: str, page_size: int = STREAM_PAGE_SIZE, max_rows: int = STREAM_MAX_ROWS, timeout: float = REQUEST_TIMEOUT_SEC):
+    # 인기순(arrange=P)으로 page_size씩 yield — 로컬 인덱스에 있는 지역은 인덱스에서
+    index = get_spot_index() if SPOT_SOURCE != "api" else None
+    if index is not None and index.has_area(area_code):
+        total = min(max_rows, index.area_size(area_code))
+        for offset in range(0, total, page_size):
+            yield index.spots_for_area(area_code, limit=min(page_size, total - offset), offset=offset)
+        return
+    if SPOT_SOURCE == "index" or not service_key:
+        return
+
+    fetched, page_no = 0, 1
+    while fetched < max_rows:
+        data = tourapi_get(
+            "areaBasedList2",
+            {
+                "areaCode": area_code,
+                "contentTypeId": CONTENT_TYPE_TOUR,
+                "numOfRows": page_size,
+                "pageNo": page_no,
+                "arrange": "P",
+            },
+            service_key,
+            timeout=timeout,
+        )
+        items = spots_from_items(safe_items(data)[: max_rows - fetched])
+        if not items:
+            return
+        yield items
+        fetched += len(items)
+        try:
+            total = int(data["response"]["body"]["totalCount"])
+        except Exception:
+            total = 0
+        if len(items) < page_size or fetched >= total:
+            return
+        page_no += 1
+
+def fetch_spots_until(area_code, service_key: str, stop, sink: list, page_size: int, max_rows: int, timeout: float = REQUEST_TIMEOUT_SEC, cancel: threading.Event = None) -> list:
+    # 페이지를 sink에 이어 붙이다가 stop(page)가 True면 더 받지 않는다.
+    # sink는 호출 쪽과 공유 → 마감 시간에 걸려도 그때까지 받은 페이지는 쓸 수 있다.
+    # cancel이 set 되면(마감 시간 지남) 다음 페이지를 요청하지 않는다 — 진행 중인 요청은 timeout으로 끝남
+    if cancel is not None and cancel.is_set():
+        return sink
+    for page in iter_spot_pages(area_code, service_key, page_size, max_rows, timeout):
+        sink.extend(page)
+        if stop is not None and stop(page):
+            break
+        if cancel is not None and cancel.is_set():
+            break
+    return sink
+
+def _fetch_area_traced(area_code, service_key: str, stop, sink: list, page_size: int, max_rows: int, timeout: float, cancel: threading.Event = None) -> list:
+    with span("fetch.area", area=area_code) as attrs:
+        fetch_spots_until(area_code, service_key, stop, sink, page_size, max_rows, timeout, cancel)
+        attrs["rows"] = len(sink)
+    return sink
+
+def fetch_areas_concurrently(
+    area_codes: list,
+    service_key: str,
+    limit: int = 180,
+    max_workers: int = FETCH_MAX_WORKERS,
+    deadline_sec: float = FETCH_DEADLINE_SEC,
+    stop_when=None,
+    max_rows: int = STREAM_MAX_ROWS,
+) -> dict:
+    # 지역별 요청을 동시에 보내고, 마감 시간 안에 받은 만큼만 돌려준다.
+    # 실패하거나 한 페이지도 못 받은 지역은 결과에서 빠진다(전체 파이프라인은 멈추지 않음).
+    # stop_when: 지역마다 새 조기 종료 판정(page -> bool)을 만들어 주는 함수.
+    #            없으면 limit개 한 페이지만, 있으면 limit개씩 max_rows까지 이어 받는다.
+    codes = list(dict.fromkeys(c for c in area_codes if c))
+    if not codes:
+        return {}
+
+    timeout = min(REQUEST_TIMEOUT_SEC, deadline_sec)
+    rows = max_rows if stop_when is not None else limit
+    sinks = {code: [] for code in codes}
+    cancel = threading.Event()
+    pool = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(codes))), thread_name_prefix="tourapi")
+    try:
+        futures = {
+            pool.submit(bind(_fetch_area_traced), code, service_key, stop_when() if stop_when else None, sinks[code], limit, rows, timeout, cancel): code
+            for code in codes
+        }
+        done, _ = wait(futures, timeout=deadline_sec)
+    finally:
+        # 늦은 요청은 기다리지 않는다(소켓 timeout으로 스스로 정리됨) — 남은 작업은 다음 페이지로 넘어가지 않게 멈춘다
+        cancel.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    results = {}
+    for fut, code in futures.items():
+        if fut in done and fut.exception() is None:
+            results[code] = fut.result()
+        elif sinks[code]:
+            results[code] = list(sinks[code])
+    return results
+
+def filter_spots_with_images(spots: list) -> list:
+    return [s for s in spots if (s.get("firstimage") or s.get("firstimage2"))]